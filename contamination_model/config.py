@@ -9,12 +9,17 @@ data_path = path.join(workspace_path, 'data')
 models_path = path.join(workspace_path, 'model')
 raw_data_path = path.join(data_path, 'raw')
 processed_data_path = path.join(data_path, 'processed')
+plots_path = path.join(workspace_path, 'plots')
 
 
 DF_PATH = raw_data_path + "/individuos_espec.csv"
 DF_TARGET_PATH = raw_data_path + "/conexoes_espec.csv"
 DF_TRAIN_PATH = processed_data_path + "/df_train.pickle"
 DF_PREDICT_PATH = processed_data_path + "/df_predict.pickle"
+DF_PERSON_PATH = processed_data_path + "/df_person.pickle"
+FEATURE_STORE_PATH = processed_data_path + "/feature_store.bin"
+MODEL_STATE_PATH = models_path + "/model_state.pickle"
+EXPLAIN_BACKGROUND_PATH = models_path + "/explain_background.pickle"
 
 to_drop_ld = [
     "taxi__V1",
@@ -65,3 +70,65 @@ metric_list = [
 ]
 
 median_fill_variables = ["IMC", "idade"]
+
+# Pipeline scheduling
+max_workers = 4
+
+# Pair features
+pair_edge_variables = ["grau", "proximidade"]
+
+pair_same_variables = [
+    "faixa_etaria",
+    "transporte_mais_utilizado",
+    "estado_civil",
+    "status_IMC",
+    "qt_filhos_status",
+    "estuda_status",
+    "trabalha_status",
+    "pratica_esportes_status",
+]
+
+pair_diff_variables = ["idade", "IMC"]
+
+# Incremental updates
+incremental_model_params = {
+    "lr": {},
+    "lasso": {"alpha": 1.0},
+    "ridge": {"alpha": 1.0},
+    "en": {"alpha": 1.0, "l1_ratio": 0.5},
+}
+
+drift_threshold = 0.2
+
+# Explanations
+explain_background_size = 1000
+explain_kmeans_size = 50
+
+# Plotting
+plot_sample_size = 100000
+
+# Validation
+individuals_schema = {
+    "name": "int",
+    "idade": "float",
+    "estado_civil": "object",
+    "qt_filhos": "float",
+    "estuda": "float",
+    "trabalha": "float",
+    "pratica_esportes": "float",
+    "transporte_mais_utilizado": "object",
+    "IMC": "float",
+}
+
+connections_schema = {
+    "V1": "int",
+    "V2": "int",
+    "grau": "object",
+    "proximidade": "object",
+    "prob_V1_V2": "float",
+}
+
+value_ranges = {
+    "idade": (0, 120),
+    "IMC": (10, 80),
+}
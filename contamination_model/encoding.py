@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class DesignEncoder:
+    def __init__(self, exclude: list = None):
+        """
+        Initialize the encoder that turns a model dataframe into a
+        numeric design matrix, one-hot encoding categorical columns.
+        Parameters
+        ----------
+        exclude : Columns ignored by the encoder, such as IDs and target.
+        """
+        self.exclude = exclude or []
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Learns the numeric columns and the categories of each
+        categorical column, following the same rule as
+        `RegressorTrainer` to tell them apart.
+        Parameters
+        ----------
+        df : Model dataframe.
+
+        Returns
+        -------
+        DesignEncoder
+        """
+        data = df.drop(self.exclude, axis=1, errors="ignore")
+
+        self.numeric_columns = data.select_dtypes(include=["int64", "float64"]).columns.to_list()
+        self.categorical_columns = data.select_dtypes(exclude=["int64", "float64"]).columns.to_list()
+        self.categories = {
+            column: sorted(data[column].dropna().unique())
+            for column in self.categorical_columns
+        }
+
+        return self
+
+    @property
+    def feature_names(self) -> list:
+        """
+        Names of the design matrix columns.
+        """
+        names = list(self.numeric_columns)
+        for column in self.categorical_columns:
+            names += ["{}_{}".format(column, category) for category in self.categories[column]]
+
+        return names
+
+    def categorical_codes(self, df: pd.DataFrame) -> list:
+        """
+        Maps each categorical column to its category codes.
+        Unknown or missing categories receive -1.
+        Parameters
+        ----------
+        df : Model dataframe.
+
+        Returns
+        -------
+        List of np.ndarray, one per categorical column.
+        """
+        return [
+            pd.Categorical(df[column], categories=self.categories[column]).codes
+            for column in self.categorical_columns
+        ]
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Builds the dense design matrix, with raw numeric columns
+        followed by the one-hot encoded categories.
+        Parameters
+        ----------
+        df : Model dataframe.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        numeric = df[self.numeric_columns].to_numpy(dtype="float64")
+        if np.isnan(numeric).any():
+            raise ValueError("Numeric columns must not contain missing values.")
+
+        design = np.zeros((len(df), len(self.feature_names)))
+        design[:, :len(self.numeric_columns)] = numeric
+
+        offset = len(self.numeric_columns)
+        rows = np.arange(len(df))
+        for column, codes in zip(self.categorical_columns, self.categorical_codes(df)):
+            known = codes >= 0
+            design[rows[known], offset + codes[known]] = 1.0
+            offset += len(self.categories[column])
+
+        return design
+
+    def transform_sparse(self, df: pd.DataFrame, center: np.ndarray = None, scale: np.ndarray = None) -> sparse.csr_matrix:
+        """
+        Builds the design matrix as a CSR matrix straight from the
+        category codes, without materializing the dense one-hot block.
+        Parameters
+        ----------
+        df : Model dataframe.
+        center : Values subtracted from the numeric columns.
+        scale : Values dividing the numeric columns.
+
+        Returns
+        -------
+        sparse.csr_matrix
+        """
+        numeric = df[self.numeric_columns].to_numpy(dtype="float64")
+        if np.isnan(numeric).any():
+            raise ValueError("Numeric columns must not contain missing values.")
+        if center is not None:
+            numeric = numeric - center
+        if scale is not None:
+            numeric = numeric / scale
+
+        n_rows, n_numeric = numeric.shape
+        rows = [np.repeat(np.arange(n_rows), n_numeric)]
+        columns = [np.tile(np.arange(n_numeric), n_rows)]
+        values = [numeric.ravel()]
+
+        offset = n_numeric
+        for column, codes in zip(self.categorical_columns, self.categorical_codes(df)):
+            known = np.flatnonzero(codes >= 0)
+            rows.append(known)
+            columns.append(offset + codes[known])
+            values.append(np.ones(len(known)))
+            offset += len(self.categories[column])
+
+        design = sparse.coo_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(n_rows, offset),
+        )
+
+        return design.tocsr()
@@ -0,0 +1,230 @@
+import json
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import Pipeline
+from contamination_model import config
+
+
+class AttributionEngine:
+    def __init__(self, backend: str = "pycaret", target: str = "prob_V1_V2"):
+        """
+        Initialize the feature attribution engine for a deployed model.
+        Linear models use the exact closed form
+        coefficient * (scaled feature - background mean); other models
+        fall back to SHAP's KernelExplainer.
+        Parameters
+        ----------
+        backend : "pycaret", "sparse" or "incremental".
+        target : Target variable, ignored when explaining.
+        """
+        self.backend = backend
+        self.target = target
+
+        if backend == "pycaret":
+            import pycaret.regression as pcr
+            self.model_path = config.models_path + "/ridge_model.pkl"
+            pipeline = pcr.load_model(config.models_path + "/ridge_model", verbose=False)
+            self.preprocessing = Pipeline(pipeline.steps[:-1])
+            self.estimator = pipeline.steps[-1][1]
+        elif backend == "sparse":
+            self.model_path = config.models_path + "/sparse_ridge_model.pickle"
+            with open(self.model_path, "rb") as file:
+                self.encoder, self.center, self.scale, self.estimator = pickle.load(file)
+        elif backend == "incremental":
+            self.model_path = config.MODEL_STATE_PATH
+            with open(self.model_path, "rb") as file:
+                state = pickle.load(file)
+            n_numeric = len(state.encoder.numeric_columns)
+            self.encoder = state.encoder
+            self.center, self.scale = state.center_[:n_numeric], state.scale_[:n_numeric]
+            self.estimator = state
+        else:
+            raise ValueError("backend must be one of ['pycaret', 'sparse', 'incremental'].")
+
+        self.is_linear = hasattr(self.estimator, "coef_")
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds the scaled design matrix the estimator sees.
+        Rows with missing numeric values are dropped by the
+        encoder-based backends.
+        Parameters
+        ----------
+        df : Model dataframe.
+
+        Returns
+        -------
+        pd.DataFrame
+            Design matrix indexed like the explained rows.
+        """
+        data = df.drop(["V1", "V2", self.target], axis=1, errors="ignore")
+
+        if self.backend == "pycaret":
+            design = self.preprocessing.transform(data)
+            return pd.DataFrame(np.asarray(design), index=df.index, columns=list(design.columns))
+
+        complete = data[self.encoder.numeric_columns].notnull().all(axis=1)
+        design = self.encoder.transform_sparse(data[complete], self.center, self.scale)
+
+        return pd.DataFrame(design.toarray(), index=df.index[complete], columns=self.encoder.feature_names)
+
+    def fit_background(self, df_train: pd.DataFrame, size: int = config.explain_background_size) -> np.ndarray:
+        """
+        Loads the background dataset from cache, or samples and
+        transforms it from the training data. The cache is rebuilt
+        when the model file is newer than it.
+        Parameters
+        ----------
+        df_train : Preprocessed train dataframe.
+        size : Number of background rows.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        model_mtime = os.path.getmtime(self.model_path)
+
+        if os.path.exists(config.EXPLAIN_BACKGROUND_PATH):
+            with open(config.EXPLAIN_BACKGROUND_PATH, "rb") as file:
+                cache = pickle.load(file)
+            if cache.get("backend") == self.backend and cache.get("model_mtime") == model_mtime \
+                    and "feature_names" in cache:
+                self.background = cache["background"]
+                self.feature_names = cache["feature_names"]
+                return self.background
+
+        sample = df_train.sample(n=min(size, len(df_train)), random_state=16)
+        background = self.transform(sample)
+        self.background = background.to_numpy()
+        self.feature_names = background.columns.to_list()
+
+        with open(config.EXPLAIN_BACKGROUND_PATH, "wb") as file:
+            pickle.dump(
+                {
+                    "backend": self.backend,
+                    "model_mtime": model_mtime,
+                    "background": self.background,
+                    "feature_names": self.feature_names,
+                },
+                file
+            )
+
+        return self.background
+
+    @property
+    def expected_value(self) -> float:
+        """
+        Model output on the mean of the background dataset.
+        """
+        mean = self.background.mean(axis=0, keepdims=True)
+
+        return float(self._predict(mean)[0])
+
+    def _predict(self, design: np.ndarray) -> np.ndarray:
+        if self.backend == "incremental":
+            return design @ self.estimator.coef_ + self.estimator.intercept_
+        if self.backend == "sparse":
+            return self.estimator.predict(sparse.csr_matrix(design))
+
+        return self.estimator.predict(design)
+
+    def explain(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the per-edge attributions of a batch.
+        Parameters
+        ----------
+        df : Model dataframe with V1 and V2.
+
+        Returns
+        -------
+        pd.DataFrame
+            V1, V2 and one attribution column per model feature.
+        """
+        design = self.transform(df)
+
+        if self.is_linear:
+            coef = np.ravel(self.estimator.coef_)
+            attributions = (design.to_numpy() - self.background.mean(axis=0)) * coef
+        else:
+            attributions = self._kernel_explainer().shap_values(design.to_numpy(), silent=True)
+
+        explanation = pd.DataFrame(attributions, index=design.index, columns=design.columns)
+        explanation.insert(0, "V2", df.loc[design.index, "V2"])
+        explanation.insert(0, "V1", df.loc[design.index, "V1"])
+
+        return explanation
+
+    def _kernel_explainer(self):
+        if not hasattr(self, "kernel_explainer"):
+            import shap
+            summary = shap.kmeans(self.background, min(config.explain_kmeans_size, len(self.background)))
+            self.kernel_explainer = shap.KernelExplainer(self._predict, summary)
+
+        return self.kernel_explainer
+
+    def explain_to_disk(self, df: pd.DataFrame, path: str, chunk_size: int = 10000) -> pd.DataFrame:
+        """
+        Explains the dataframe in chunks, appending each chunk's
+        per-edge attributions to a CSV file and accumulating the
+        global attributions.
+        Parameters
+        ----------
+        df : Model dataframe with V1 and V2.
+        path : Destination CSV path for per-edge attributions.
+        chunk_size : Number of edges per chunk.
+
+        Returns
+        -------
+        pd.DataFrame
+            Mean absolute and mean attribution per feature, sorted by
+            mean absolute attribution. Empty if no edge was explained.
+        """
+        columns = ["mean_abs_attribution", "mean_attribution"]
+        if len(df) == 0:
+            pd.DataFrame(columns=["V1", "V2"] + self.feature_names).to_csv(path, index=False)
+            return pd.DataFrame(columns=columns, dtype="float64")
+
+        abs_sum, total_sum, n_rows = 0.0, 0.0, 0
+
+        for start in range(0, len(df), chunk_size):
+            explanation = self.explain(df.iloc[start:start + chunk_size])
+            explanation.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+            attributions = explanation.drop(["V1", "V2"], axis=1)
+            abs_sum = abs_sum + attributions.abs().sum()
+            total_sum = total_sum + attributions.sum()
+            n_rows += len(attributions)
+
+        if n_rows == 0:
+            return pd.DataFrame(columns=columns, dtype="float64")
+
+        global_attributions = pd.DataFrame({
+            "mean_abs_attribution": abs_sum / n_rows,
+            "mean_attribution": total_sum / n_rows,
+        })
+
+        return global_attributions.sort_values("mean_abs_attribution", ascending=False)
+
+
+def export_global_attributions(global_attributions: pd.DataFrame, expected_value: float, path: str) -> None:
+    """
+    Exports the global attributions and the model's expected value
+    to a json file.
+
+    Parameters
+    ----------
+    global_attributions : Mean absolute and mean attribution per feature.
+    expected_value : Model output on the mean background row.
+    path : Destination json path.
+    """
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "expected_value": expected_value,
+                "features": global_attributions.to_dict(orient="index"),
+            },
+            file
+        )
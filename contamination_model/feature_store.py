@@ -0,0 +1,275 @@
+import json
+import mmap
+import os
+import struct
+import numpy as np
+import pandas as pd
+
+MAGIC = b"CMFS"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<4sII")
+ALIGNMENT = 64
+
+
+def write_feature_store(df_person: pd.DataFrame, path: str) -> str:
+    """
+    Writes the preprocessed person features as a fixed-width,
+    ID-indexed float64 matrix behind a versioned JSON header.
+    Categorical columns are stored as category codes. The file is
+    written aside and atomically swapped in, so open readers keep
+    their mapping of the previous version.
+
+    Parameters
+    ----------
+    df_person : pd.DataFrame
+        Dataframe with one preprocessed row per person.
+    path : str
+        Destination file path.
+
+    Returns
+    -------
+    str
+        The destination file path.
+    """
+    person_ids = df_person["name"].to_numpy(dtype="int64")
+    if len(np.unique(person_ids)) != len(person_ids):
+        raise ValueError("Person IDs in 'name' must be unique.")
+
+    data = df_person.drop("name", axis=1)
+    numeric_columns = data.select_dtypes(include=["int64", "float64"]).columns.to_list()
+
+    min_id = int(person_ids.min())
+    n_ids = int(person_ids.max()) - min_id + 1
+    rows = person_ids - min_id
+
+    matrix = np.full((n_ids, data.shape[1]), np.nan)
+    present = np.zeros(n_ids, dtype="uint8")
+    present[rows] = 1
+
+    columns = []
+    for position, column in enumerate(data.columns):
+        if column in numeric_columns:
+            matrix[rows, position] = data[column].to_numpy(dtype="float64")
+            columns.append({"name": column, "categories": None})
+        else:
+            codes, categories = pd.factorize(data[column])
+            matrix[rows, position] = np.where(codes < 0, np.nan, codes)
+            columns.append({"name": column, "categories": categories.to_list()})
+
+    header = {
+        "version": _next_version(path),
+        "min_id": min_id,
+        "n_ids": n_ids,
+        "columns": columns,
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_offset = _align(PREAMBLE.size + len(header_bytes))
+
+    tmp_path = "{}.tmp-{}".format(path, os.getpid())
+    with open(tmp_path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        file.write(b"\0" * (data_offset - file.tell()))
+        file.write(matrix.tobytes())
+        file.write(present.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def read_header(path: str) -> dict:
+    """
+    Reads the header of a feature store file.
+
+    Parameters
+    ----------
+    path : str
+        Feature store file path.
+
+    Returns
+    -------
+    dict
+        The header, including the data offset.
+    """
+    with open(path, "rb") as file:
+        return _read_header(file)
+
+
+def _read_header(file) -> dict:
+    magic, format_version, header_size = PREAMBLE.unpack(file.read(PREAMBLE.size))
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise ValueError("{} is not a version {} feature store.".format(file.name, FORMAT_VERSION))
+
+    header = json.loads(file.read(header_size).decode("utf-8"))
+    header["data_offset"] = _align(PREAMBLE.size + header_size)
+
+    return header
+
+
+def _next_version(path: str) -> int:
+    try:
+        return read_header(path)["version"] + 1
+    except (OSError, ValueError):
+        return 1
+
+
+def _align(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class FeatureStore:
+    def __init__(self, path: str):
+        """
+        Opens a feature store read-only. The matrix is memory mapped,
+        so several processes opening the same file share its pages.
+        Parameters
+        ----------
+        path : Feature store file path.
+        """
+        self.path = path
+        self._open()
+
+    def _open(self, version: int = None) -> bool:
+        """
+        Reads the header and maps the data through a single file handle,
+        so both always come from the same version of the file, even if
+        `features` swaps in a new one meanwhile. Skips the mapping if
+        the file is still at `version`.
+        """
+        with open(self.path, "rb") as file:
+            header = _read_header(file)
+            if header["version"] == version:
+                return False
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        n_columns = len(header["columns"])
+
+        self.version = header["version"]
+        self.min_id = header["min_id"]
+        self.n_ids = header["n_ids"]
+        self.columns = [column["name"] for column in header["columns"]]
+        self.categories = {
+            column["name"]: np.array(column["categories"], dtype=object)
+            for column in header["columns"] if column["categories"] is not None
+        }
+
+        self._buffer = buffer
+        self.matrix = np.frombuffer(
+            buffer, dtype="float64", count=self.n_ids * n_columns, offset=header["data_offset"],
+        ).reshape(self.n_ids, n_columns)
+        self.present = np.frombuffer(
+            buffer, dtype="uint8", count=self.n_ids, offset=header["data_offset"] + self.matrix.nbytes,
+        )
+
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Reopens the store if `features` swapped in a new version.
+        Returns
+        -------
+        True if a new version was loaded.
+        """
+        return self._open(version=self.version)
+
+    def positions(self, ids) -> np.ndarray:
+        """
+        Maps person IDs to matrix rows. Unknown IDs receive -1.
+        Parameters
+        ----------
+        ids : Person IDs.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        rows = np.asarray(ids, dtype="int64") - self.min_id
+        in_range = (rows >= 0) & (rows < self.n_ids)
+        rows = np.where(in_range, rows, 0)
+
+        return np.where(in_range & (self.present[rows] == 1), rows, -1)
+
+    def person_frame(self, ids) -> pd.DataFrame:
+        """
+        Builds the person features of the given IDs, with decoded
+        categories. Unknown IDs get NaN features.
+        Parameters
+        ----------
+        ids : Person IDs.
+
+        Returns
+        -------
+        pd.DataFrame
+            Dataframe in the layout of `preprocess.preprocess_person_data`.
+        """
+        rows = self.positions(ids)
+        values = np.array(self.matrix[rows])
+        values[rows < 0] = np.nan
+
+        person = pd.DataFrame({"name": np.asarray(ids, dtype="int64")})
+        for position, column in enumerate(self.columns):
+            person[column] = self._decode(column, values[:, position])
+
+        return person
+
+    def edge_frame(self, df_edges: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds the wide V1/V2 model dataframe of the given edges, in
+        the layout of `preprocess.preprocess_predict_data`.
+        Parameters
+        ----------
+        df_edges : Dataframe with the V1 and V2 connections.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        edge_df = df_edges.reset_index(drop=True)
+        frames = [edge_df]
+
+        for side in ["V1", "V2"]:
+            person = self.person_frame(edge_df[side]).drop("name", axis=1)
+            for column in person.select_dtypes(include="object"):
+                person[column] = person[column] + "__{}".format(side)
+            person.columns = ["{}_{}".format(column, side) for column in person.columns]
+            frames.append(person)
+
+        return pd.concat(frames, axis=1)
+
+    def lookup(self, v1: int, v2: int) -> dict:
+        """
+        Features of a single (V1, V2) pair, in O(1), with the same
+        keys and values as a row of `edge_frame`.
+        Parameters
+        ----------
+        v1 : The contaminated person ID.
+        v2 : The new infected person ID.
+
+        Returns
+        -------
+        dict
+        """
+        features = {"V1": v1, "V2": v2}
+
+        for side, row in zip(["V1", "V2"], self.positions([v1, v2])):
+            values = self.matrix[row] if row >= 0 else np.full(len(self.columns), np.nan)
+
+            for column, value in zip(self.columns, values.tolist()):
+                if column in self.categories and not np.isnan(value):
+                    value = "{}__{}".format(self.categories[column][int(value)], side)
+                features["{}_{}".format(column, side)] = value
+
+        return features
+
+    def _decode(self, column: str, values: np.ndarray) -> np.ndarray:
+        if column not in self.categories:
+            return values
+
+        known = ~np.isnan(values)
+        decoded = np.full(len(values), np.nan, dtype=object)
+        decoded[known] = self.categories[column][values[known].astype("int64")]
+
+        return decoded
@@ -0,0 +1,275 @@
+import numpy as np
+import pandas as pd
+from contamination_model import config
+from contamination_model.encoding import DesignEncoder
+
+
+class IncrementalLinearModel:
+    def __init__(self, model: str = "ridge", target: str = "prob_V1_V2", pair_features: bool = False):
+        """
+        Initialize a linear model that keeps the sufficient statistics
+        of its training data, so new labeled edges are folded in
+        without revisiting the history.
+        Parameters
+        ----------
+        model : One of config.models_list.
+        target : Target variable.
+        pair_features : Whether the model is trained on pair features
+            instead of the wide V1/V2 join.
+        """
+        if model not in config.models_list:
+            raise ValueError("model must be one of {}.".format(config.models_list))
+
+        self.model = model
+        self.target = target
+        self.pair_features = pair_features
+        self.params = config.incremental_model_params[model]
+        self.encoder = DesignEncoder(exclude=["V1", "V2", target])
+        self.n_samples = 0
+        self.fitted_edges = {}
+        self.updated_edges = {}
+        self.coef_ = None
+        self.baseline_coef_ = None
+
+    def partial_fit(self, df: pd.DataFrame):
+        """
+        Accumulates X'X, X'y and the column sums of new labeled edges
+        and solves the model again. Runs in time proportional to the
+        new data, plus a solve in the number of features. Every row is
+        counted, so fitting the whole training data at once matches a
+        regular fit on it.
+        Parameters
+        ----------
+        df : Model dataframe with new labeled edges.
+
+        Returns
+        -------
+        IncrementalLinearModel
+        """
+        if len(df) == 0:
+            return self
+
+        if self.n_samples == 0:
+            self._initialize(df)
+
+        y = df[self.target].to_numpy(dtype="float64")
+        self._accumulate(self.encoder.transform(df), y)
+        self.fitted_edges.update(zip(zip(df["V1"], df["V2"]), y))
+
+        self._solve()
+        if self.baseline_coef_ is None:
+            self.baseline_coef_ = self.coef_.copy()
+
+        return self
+
+    def update(self, df: pd.DataFrame):
+        """
+        Folds in a batch of labeled edges from `update_model`, keeping
+        the last label of each (V1, V2) pair in the batch.
+        A pair folded in by an earlier update is relabeled: its previous
+        row is subtracted from the statistics before the new one is added.
+        Pairs of the full refit are skipped, since their rows are not kept;
+        the ones with a different label are counted in `n_conflicts` and
+        need a refit to be replaced.
+        Parameters
+        ----------
+        df : Model dataframe with new labeled edges.
+
+        Returns
+        -------
+        IncrementalLinearModel
+        """
+        df = df.drop_duplicates(["V1", "V2"], keep="last")
+        edges = list(zip(df["V1"], df["V2"]))
+        y = df[self.target].to_numpy(dtype="float64")
+
+        keep = np.ones(len(df), dtype=bool)
+        relabeled = []
+        self.n_conflicts = 0
+
+        for position, (edge, label) in enumerate(zip(edges, y)):
+            if edge in self.updated_edges:
+                if self.updated_edges[edge][1] == label:
+                    keep[position] = False
+                else:
+                    relabeled.append(self.updated_edges[edge])
+            elif edge in self.fitted_edges:
+                keep[position] = False
+                self.n_conflicts += int(self.fitted_edges[edge] != label)
+
+        self.n_relabeled = len(relabeled)
+        self.n_added = int(keep.sum()) - self.n_relabeled
+        self.n_skipped = len(df) - int(keep.sum())
+
+        if not keep.any():
+            return self
+
+        df = df[keep]
+        if self.n_samples == 0:
+            self._initialize(df)
+
+        design = self.encoder.transform(df)
+        if relabeled:
+            old_design, old_y = map(np.array, zip(*relabeled))
+            self._accumulate(old_design, old_y, sign=-1)
+        self._accumulate(design, y[keep])
+        self.updated_edges.update(zip(
+            [edge for edge, kept in zip(edges, keep) if kept], zip(design, y[keep])))
+
+        self._solve()
+        if self.baseline_coef_ is None:
+            self.baseline_coef_ = self.coef_.copy()
+
+        return self
+
+    def _initialize(self, df: pd.DataFrame):
+        """
+        Fits the encoder and allocates the sufficient statistics.
+        """
+        self.encoder.fit(df)
+        n_features = len(self.encoder.feature_names)
+        self.sum_x = np.zeros(n_features)
+        self.sum_y = 0.0
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+
+    def _accumulate(self, design: np.ndarray, y: np.ndarray, sign: int = 1):
+        """
+        Adds (sign=1) or removes (sign=-1) rows from the sufficient statistics.
+        """
+        self.n_samples += sign * len(y)
+        self.sum_x += sign * design.sum(axis=0)
+        self.sum_y += sign * y.sum()
+        self.xtx += sign * design.T @ design
+        self.xty += sign * design.T @ y
+
+    def _scaling(self):
+        """
+        Z-score statistics of the numeric columns, matching the
+        `normalize=True` semantics of the PyCaret session. One-hot
+        columns are left unscaled.
+        """
+        n_numeric = len(self.encoder.numeric_columns)
+        mean_x = self.sum_x / self.n_samples
+
+        center = np.zeros_like(mean_x)
+        scale = np.ones_like(mean_x)
+        center[:n_numeric] = mean_x[:n_numeric]
+
+        variance = np.diag(self.xtx)[:n_numeric] / self.n_samples - mean_x[:n_numeric] ** 2
+        std = np.sqrt(np.clip(variance, 0, None))
+        scale[:n_numeric] = np.where(std > 0, std, 1.0)
+
+        return center, scale
+
+    def _solve(self):
+        """
+        Solves the model on the centered and scaled sufficient statistics.
+        """
+        n = self.n_samples
+        mean_x = self.sum_x / n
+        mean_y = self.sum_y / n
+        self.center_, self.scale_ = self._scaling()
+
+        gram = (self.xtx - n * np.outer(mean_x, mean_x)) / np.outer(self.scale_, self.scale_)
+        xy = (self.xty - n * mean_x * mean_y) / self.scale_
+
+        if self.model == "lr":
+            coef = np.linalg.lstsq(gram, xy, rcond=None)[0]
+        elif self.model == "ridge":
+            coef = np.linalg.solve(gram + self.params["alpha"] * np.eye(len(xy)), xy)
+        else:
+            coef = _coordinate_descent(
+                gram, xy, n,
+                alpha=self.params["alpha"],
+                l1_ratio=self.params.get("l1_ratio", 1.0),
+                warm_start=self.coef_,
+            )
+
+        self.coef_ = coef
+        self.intercept_ = mean_y - ((mean_x - self.center_) / self.scale_) @ coef
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Predicts the target for a model dataframe. Rows with missing
+        numeric values receive NaN.
+        Parameters
+        ----------
+        df : Model dataframe.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        complete = df[self.encoder.numeric_columns].notnull().all(axis=1).to_numpy()
+        design = (self.encoder.transform(df[complete]) - self.center_) / self.scale_
+
+        prediction = np.full(len(df), np.nan)
+        prediction[complete] = design @ self.coef_ + self.intercept_
+
+        return prediction
+
+    def coefficients(self) -> pd.Series:
+        """
+        Model coefficients, on the scaled features, indexed by feature name.
+        """
+        return pd.Series(self.coef_, index=self.encoder.feature_names)
+
+    def drift(self) -> float:
+        """
+        Relative L2 distance between the current coefficients and
+        the coefficients of the last full refit.
+        Returns
+        -------
+        float
+        """
+        baseline_norm = np.linalg.norm(self.baseline_coef_)
+        distance = np.linalg.norm(self.coef_ - self.baseline_coef_)
+
+        return distance / baseline_norm if baseline_norm > 0 else distance
+
+
+def _coordinate_descent(
+        gram: np.ndarray,
+        xy: np.ndarray,
+        n_samples: int,
+        alpha: float,
+        l1_ratio: float,
+        warm_start: np.ndarray = None,
+        max_iter: int = 1000,
+        tol: float = 1e-4
+) -> np.ndarray:
+    """
+    Cyclic coordinate descent for lasso/elastic net using only the
+    Gram matrix, with the same objective as scikit-learn.
+    """
+    l1_penalty = alpha * l1_ratio * n_samples
+    l2_penalty = alpha * (1 - l1_ratio) * n_samples
+
+    if warm_start is not None and len(warm_start) == len(xy):
+        coef = warm_start.copy()
+    else:
+        coef = np.zeros(len(xy))
+    gram_coef = gram @ coef
+
+    for _ in range(max_iter):
+        max_update = 0.0
+
+        for j in range(len(xy)):
+            denominator = gram[j, j] + l2_penalty
+            if denominator == 0:
+                continue
+
+            rho = xy[j] - gram_coef[j] + gram[j, j] * coef[j]
+            new_value = np.sign(rho) * max(abs(rho) - l1_penalty, 0.0) / denominator
+            update = new_value - coef[j]
+
+            if update != 0:
+                gram_coef += gram[:, j] * update
+                coef[j] = new_value
+                max_update = max(max_update, abs(update))
+
+        if max_update < tol * max(np.abs(coef).max(), 1e-12):
+            break
+
+    return coef
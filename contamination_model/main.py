@@ -1,13 +1,31 @@
+import os
+import time
 import pandas as pd
 import fire
 import pickle
-from contamination_model import config, preprocess, modelling
-
-
-def features(df_path: str = config.DF_PATH, df_target_path: str = config.DF_TARGET_PATH) -> None:
+from functools import partial
+from contamination_model import config, preprocess, modelling, scheduler, utils, incremental, feature_store
+from contamination_model import explain as explain_module, validation
+
+trainers = {
+    "pycaret": (modelling.RegressorTrainer, "/ridge_model"),
+    "sparse": (modelling.SparseRegressorTrainer, "/sparse_ridge_model"),
+}
+
+
+def features(
+        df_path: str = config.DF_PATH,
+        df_target_path: str = config.DF_TARGET_PATH,
+        max_workers: int = config.max_workers,
+        executor: str = "thread",
+        pair_features: bool = False,
+        validate_data: bool = True,
+        fail_fast: bool = False
+) -> None:
     """
     Generates the features to create the train and test dataframes for
-    model stage.
+    model stage. Independent stages, such as building the train and
+    predict dataframes and saving them, run concurrently.
 
     Parameters
     ----------
@@ -15,36 +33,98 @@ def features(df_path: str = config.DF_PATH, df_target_path: str = config.DF_TARG
         Path to data for individual analysis, by default df_path
     df_target_path : str, optional
         Path to data for connection analysis, by default df_target_path
+    max_workers : int, optional
+        Number of concurrent workers, by default config.max_workers
+    executor : str, optional
+        "thread" or "process" pool, by default "thread"
+    pair_features : bool, optional
+        Builds compact pair-feature dataframes instead of the wide
+        V1/V2 join, by default False
+    validate_data : bool, optional
+        Runs the data-quality checks right after load, by default True
+    fail_fast : bool, optional
+        Stops before any preprocessing on the first failed check,
+        by default False
 
     """
-    df = pd.read_csv(df_path, sep=";")
-    df_target = pd.read_csv(df_target_path, sep=";")
+    utils.create_directories([config.models_path, config.processed_data_path])
+
+    dag = scheduler.DagScheduler("features")
+    dag.add_stage("load_individuals", partial(pd.read_csv, df_path, sep=";"))
+    dag.add_stage("load_connections", partial(pd.read_csv, df_target_path, sep=";"))
+    if validate_data:
+        dag.add_stage("validate", partial(_validate_inputs, fail_fast=fail_fast), ["load_individuals", "load_connections"])
+        dag.add_stage("person_features", _preprocess_person_data, ["load_individuals", "validate"])
+    else:
+        dag.add_stage("person_features", _preprocess_person_data, ["load_individuals"])
+    if pair_features:
+        dag.add_stage("train_dataframe", preprocess.create_pair_target_dataframe, ["load_connections", "person_features"])
+        dag.add_stage("predict_dataframe", preprocess.create_pair_predict_dataframe, ["load_connections", "person_features"])
+    else:
+        dag.add_stage("person_dataframes", preprocess.create_person_dataframes, ["person_features"])
+        dag.add_stage("train_dataframe", _build_train_dataframe, ["load_connections", "person_dataframes"])
+        dag.add_stage("predict_dataframe", _build_predict_dataframe, ["load_connections", "person_dataframes"])
+    dag.add_stage("save_train", partial(utils.save_pickle, path=config.DF_TRAIN_PATH), ["train_dataframe"])
+    dag.add_stage("save_predict", partial(utils.save_pickle, path=config.DF_PREDICT_PATH), ["predict_dataframe"])
+    dag.add_stage("save_person", partial(utils.save_pickle, path=config.DF_PERSON_PATH), ["person_features"])
+    dag.add_stage("save_feature_store", partial(feature_store.write_feature_store, path=config.FEATURE_STORE_PATH), ["person_features"])
 
-    print("Creating Train Dataframe.")
-    df_train, df_v1, df_v2 = preprocess.preprocess_data(df, df_target)
+    print("Creating Train and Test Dataframes.")
+    dag.run(max_workers=max_workers, executor=executor)
 
-    print("Creating Test Dataframe.")
-    df_predict = preprocess.preprocess_predict_data(df_target, df_v1, df_v2)
+    print("Preprocessed data saved at: {}".format(config.processed_data_path))
+    print(dag.timing_report())
 
-    dataframe_list = [df_train, df_predict]
-    dataframe_names = ["df_train", "df_predict"]
 
-    print("Saving preprocessed data.")
-    for data, name in zip(dataframe_list, dataframe_names):
-        pickle.dump(data,
-                    open(
-                        config.processed_data_path + "/{}.pickle".format(
-                            name),
-                        "wb")
-                    )
+def validate(df_path: str = config.DF_PATH, df_target_path: str = config.DF_TARGET_PATH, fail_fast: bool = False):
+    """
+    Runs the data-quality checks on the raw data.
+    Parameters
+    ----------
+    df_path : Path to data for individual analysis.
+    df_target_path : Path to data for connection analysis.
+    fail_fast : Stops on the first failed check.
 
+    Returns
+    -------
 
-def deploy_model(df_train_path: str = config.DF_TRAIN_PATH):
+    """
+    _validate_inputs(pd.read_csv(df_path, sep=";"), pd.read_csv(df_target_path, sep=";"), fail_fast)
+
+
+def _validate_inputs(df: pd.DataFrame, df_target: pd.DataFrame, fail_fast: bool = False) -> pd.DataFrame:
+    report = validation.validate_inputs(df, df_target, fail_fast)
+
+    print("Data Validation Report:")
+    print(report.drop("detail", axis=1).to_string(index=False))
+
+    failed = report[report["status"] == "failed"]
+    for _, row in failed.iterrows():
+        print("{}.{}: {}".format(row["dataset"], row["check"], row["detail"]))
+
+    return report
+
+
+def _preprocess_person_data(df: pd.DataFrame, *validation_report) -> pd.DataFrame:
+    return preprocess.preprocess_person_data(df)
+
+
+def _build_train_dataframe(df_target: pd.DataFrame, person_dataframes: tuple) -> pd.DataFrame:
+    return preprocess.create_target_dataframe(df_target, list(person_dataframes))
+
+
+def _build_predict_dataframe(df_target: pd.DataFrame, person_dataframes: tuple) -> pd.DataFrame:
+    return preprocess.preprocess_predict_data(df_target, *person_dataframes)
+
+
+def deploy_model(df_train_path: str = config.DF_TRAIN_PATH, backend: str = "pycaret"):
     """
     Deploys the model.
     Parameters
     ----------
     df_train_path : Path for train data preprocessed.
+    backend : "pycaret" for a dense PyCaret session or "sparse" for
+        a sparse CSR design matrix.
 
     Returns
     -------
@@ -55,13 +135,14 @@ def deploy_model(df_train_path: str = config.DF_TRAIN_PATH):
 
     # Model Stage
     print("Starting Model Stage")
-    model = modelling.RegressorTrainer(
+    trainer_class, model_name = trainers[backend]
+    model = trainer_class(
         df.drop(["V1", "V2"], axis=1),
         "prob_V1_V2",
         "Training Stage"
     )
 
-    print("Setting up Pycaret Environment")
+    print("Setting up {} Environment".format(backend))
     model.start_session()
 
     print("Training The Model")
@@ -71,10 +152,101 @@ def deploy_model(df_train_path: str = config.DF_TRAIN_PATH):
     model.finalize_model()
 
     print("Generated Model Saved at: {}".format(config.models_path))
-    model.save_model(config.models_path, "/ridge_model")
+    model.save_model(config.models_path, model_name)
 
 
-def predict_model(df_predict_path: str = config.DF_PREDICT_PATH, target: str = "prob_V1_V2", validation: bool = False):
+def compare_training_backends(df_train_path: str = config.DF_TRAIN_PATH, model: str = "ridge"):
+    """
+    Compares design matrix memory and fit time of the PyCaret and
+    sparse training backends.
+    Parameters
+    ----------
+    df_train_path : Path for train data preprocessed.
+    model : Model from config.models_list.
+
+    Returns
+    -------
+
+    """
+    df = pickle.load(open(df_train_path, "rb"))
+
+    report = modelling.compare_backends(df.drop(["V1", "V2"], axis=1), "prob_V1_V2", model)
+    print(report)
+
+    report.to_json(config.models_path + "/backend_comparison.json")
+
+
+def update_model(
+        new_edges_path: str,
+        df_train_path: str = config.DF_TRAIN_PATH,
+        model: str = None,
+        pair_features: bool = None,
+        refit: bool = False
+):
+    """
+    Folds new labeled edges into the stored incremental model state,
+    without a full retraining.
+    Parameters
+    ----------
+    new_edges_path : Path to new labeled connections, in the conexoes_espec format.
+    df_train_path : Path for train data preprocessed. Used for the full refit
+        when there is no stored state or refit is True.
+    model : Linear model from config.models_list, by default "ridge" on a
+        full refit. Must match the stored state otherwise.
+    pair_features : Whether df_train holds pair features, by default False
+        on a full refit. Must match the stored state otherwise.
+    refit : Rebuilds the state from df_train, resetting the drift baseline.
+
+    Returns
+    -------
+
+    """
+    if refit or not os.path.exists(config.MODEL_STATE_PATH):
+        print("Fitting Model State on Full Training Data")
+        state = incremental.IncrementalLinearModel(model or "ridge", pair_features=bool(pair_features))
+        state.partial_fit(pickle.load(open(df_train_path, "rb")))
+    else:
+        state = pickle.load(open(config.MODEL_STATE_PATH, "rb"))
+
+        if model is not None and model != state.model:
+            raise ValueError(
+                "Stored model state uses '{}', not '{}'. Pass --refit to rebuild it.".format(state.model, model))
+        if pair_features is not None and pair_features != state.pair_features:
+            raise ValueError(
+                "Stored model state has pair_features={}. Pass --refit to rebuild it.".format(state.pair_features))
+
+    new_edges = pd.read_csv(new_edges_path, sep=";")
+    df_person = pickle.load(open(config.DF_PERSON_PATH, "rb"))
+
+    if state.pair_features:
+        df_new = preprocess.create_pair_target_dataframe(new_edges, df_person)
+    else:
+        df_new = preprocess.create_target_dataframe(
+            new_edges, list(preprocess.create_person_dataframes(df_person)))
+
+    state.update(df_new)
+    print("Updated Model State with {} New and {} Relabeled Edges, Skipped {} Already Folded In".format(
+        state.n_added, state.n_relabeled, state.n_skipped))
+    if state.n_conflicts:
+        print("Warning: {} Edges of the Full Refit Have a New Label and Were Kept As Is. "
+              "Run update_model --refit on Relabeled Training Data to Apply Them.".format(state.n_conflicts))
+
+    drift = state.drift()
+    print("Coefficient Drift Against Last Full Refit: {:.4f}".format(drift))
+    if drift > config.drift_threshold:
+        print("Drift above {}. Consider running deploy_model and update_model --refit.".format(
+            config.drift_threshold))
+
+    utils.save_pickle(state, config.MODEL_STATE_PATH)
+    print("Model State Saved at: {}".format(config.MODEL_STATE_PATH))
+
+
+def predict_model(
+        df_predict_path: str = config.DF_PREDICT_PATH,
+        target: str = "prob_V1_V2",
+        validation: bool = False,
+        backend: str = "pycaret"
+):
     """
     Predicts data.
     Parameters
@@ -82,6 +254,8 @@ def predict_model(df_predict_path: str = config.DF_PREDICT_PATH, target: str = "
     df_predict_path : Unseed preprocessed data.
     target : Target variable. For validation only.
     validation : Exports metrics if True. For validation only.
+    backend : "pycaret" or "sparse" for the deployed model of that
+        backend, or "incremental" for the model state kept by update_model.
 
     Returns
     -------
@@ -90,30 +264,161 @@ def predict_model(df_predict_path: str = config.DF_PREDICT_PATH, target: str = "
 
     predict = pickle.load(open(df_predict_path, "rb"))
 
-    model = modelling.RegressorTrainer(
-        predict.drop(["V1", "V2"], axis=1),
-        "prob_V1_V2",
-        "Prediction Stage"
-    )
-    model.load_model(config.models_path + "/ridge_model")
-
     if validation:
-        prediction = model.predict_model(predict, target, export_metrics=True)
+        prediction = _predict(predict, backend, target, export_metrics=True)
     else:
-        prediction = model.predict_model(predict)
+        prediction = _predict(predict, backend)
 
     pickle.dump(prediction, open(config.models_path + "/prediction.pickle", "wb"))
     print("Prediction Stage is Done.")
 
 
-def run():
+def explain(
+        df_predict_path: str = config.DF_PREDICT_PATH,
+        df_train_path: str = config.DF_TRAIN_PATH,
+        backend: str = "pycaret",
+        chunk_size: int = 10000
+):
+    """
+    Computes per-edge and global feature attributions for the
+    predicted edges, streaming them to disk in chunks.
+    Parameters
+    ----------
+    df_predict_path : Unseed preprocessed data.
+    df_train_path : Path for train data preprocessed, sampled for the
+        cached background dataset.
+    backend : "pycaret", "sparse" or "incremental".
+    chunk_size : Number of edges explained per chunk.
+
+    Returns
+    -------
+
+    """
+    predict = pickle.load(open(df_predict_path, "rb"))
+
+    engine = explain_module.AttributionEngine(backend)
+    engine.fit_background(pickle.load(open(df_train_path, "rb")))
+
+    print("Explaining {} Edges".format(len(predict)))
+    global_attributions = engine.explain_to_disk(
+        predict, config.models_path + "/explanations.csv", chunk_size)
+
+    print("Global Attributions:")
+    print(global_attributions.head(10))
+    explain_module.export_global_attributions(
+        global_attributions, engine.expected_value, config.models_path + "/global_attributions.json")
+    print("Explanations Saved at: {}".format(config.models_path))
+
+
+def score_edges(
+        edges_path: str,
+        feature_store_path: str = config.FEATURE_STORE_PATH,
+        backend: str = "pycaret",
+        pair_features: bool = False
+):
+    """
+    Scores a batch of connections reading person features from the
+    memory-mapped feature store, so parallel scoring jobs share a
+    single copy of them.
+    Parameters
+    ----------
+    edges_path : Path to connections to score, in the conexoes_espec format.
+    feature_store_path : Path to the feature store written by features.
+    backend : "pycaret", "sparse" or "incremental".
+    pair_features : Whether the model was trained on pair features.
+
+    Returns
+    -------
+
+    """
+    edges = pd.read_csv(edges_path, sep=";")
+    store = feature_store.FeatureStore(feature_store_path)
+
+    if pair_features:
+        person_ids = pd.unique(edges[["V1", "V2"]].to_numpy().ravel())
+        data = preprocess.create_pair_features(edges, store.person_frame(person_ids))
+    else:
+        data = store.edge_frame(edges)
+
+    prediction = _predict(data, backend)
+
+    output_path = config.models_path + "/scored_edges_v{}.pickle".format(store.version)
+    utils.save_pickle(prediction, output_path)
+    print("Scored Edges Saved at: {}".format(output_path))
+
+
+def _predict(data: pd.DataFrame, backend: str, target: str = None, export_metrics: bool = False) -> pd.DataFrame:
+    if backend == "incremental":
+        state = pickle.load(open(config.MODEL_STATE_PATH, "rb"))
+        prediction = data.copy()
+        prediction["Label"] = state.predict(data)
+
+        if export_metrics:
+            modelling.evaluation_metrics(prediction, target, export_metrics)
+
+        return prediction
+
+    trainer_class, model_name = trainers[backend]
+    model = trainer_class(
+        data.drop(["V1", "V2"], axis=1),
+        "prob_V1_V2",
+        "Prediction Stage"
+    )
+    model.load_model(config.models_path + model_name)
+
+    return model.predict_model(data, target, export_metrics)
+
+
+def plot_categories(
+        df_train_path: str = config.DF_TRAIN_PATH,
+        columns: list = None,
+        output_dir: str = config.plots_path,
+        kind: str = "kde",
+        bins: int = 50,
+        sample_size: int = config.plot_sample_size
+):
+    """
+    Exports the target distribution plot of every category column.
+    Parameters
+    ----------
+    df_train_path : Path for train data preprocessed.
+    columns : Category columns to plot. Uses every categorical column if None.
+    output_dir : Directory for the exported plots.
+    kind : "kde" or "hist".
+    bins : Number of bins.
+    sample_size : Maximum number of edges per category.
+
+    Returns
+    -------
+
+    """
+    df = pickle.load(open(df_train_path, "rb"))
+    columns = columns or df.select_dtypes(exclude=["int64", "float64"]).columns.to_list()
+
+    paths = utils.export_category_plots(df, columns, output_dir, "prob_V1_V2", kind, bins, sample_size)
+    print("{} Plots Saved at: {}".format(len(paths), output_dir))
+
+
+def run(max_workers: int = config.max_workers):
     """
-    Run all model pipeline steps sequentially.
+    Run all model pipeline steps sequentially, reporting the duration of each.
     :return:
     """
-    features()
-    deploy_model()
-    predict_model()
+    stages = [
+        ("features", partial(features, max_workers=max_workers)),
+        ("deploy_model", deploy_model),
+        ("predict_model", predict_model),
+    ]
+    durations = []
+
+    for name, stage in stages:
+        start = time.perf_counter()
+        stage()
+        durations.append((name, time.perf_counter() - start))
+
+    print("run timing report:")
+    for name, duration in durations:
+        print("  {:<24} duration {:>8.2f}s".format(name, duration))
 
 
 def cli():
@@ -1,8 +1,21 @@
 import json
+import pickle
+import time
+import numpy as np
 import pandas as pd
 import pycaret.regression as pcr
 from contamination_model import config
+from contamination_model.encoding import DesignEncoder
 from pycaret.utils import check_metric
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold, cross_validate, train_test_split
+
+sparse_estimators = {
+    "lr": lambda session_id: LinearRegression(),
+    "lasso": lambda session_id: Lasso(random_state=session_id),
+    "ridge": lambda session_id: Ridge(random_state=session_id),
+    "en": lambda session_id: ElasticNet(random_state=session_id),
+}
 
 
 def evaluation_metrics(df: pd.DataFrame, target: str, export_metrics: bool = False) -> None:
@@ -156,3 +169,198 @@ class RegressorTrainer:
     @property
     def get_model(self):
         return self.model
+
+
+class SparseRegressorTrainer:
+    def __init__(self, df: pd.DataFrame, target: str, exp_name: str, session_id: int = 16):
+        """
+        Initialize classe objects. Same interface as RegressorTrainer,
+        training the models_list estimators on a sparse CSR design matrix
+        instead of a dense PyCaret one-hot encoding.
+        Parameters
+        ----------
+        df : Cleaned dataframe for model ingestion.
+        target : Target variable.
+        exp_name : Model experiment name.
+        session_id : experiment's random state.
+        """
+        self.df = df
+        self.target = target
+        self.exp_name = exp_name
+        self.session_id = session_id
+
+    def start_session(self, train_size: float = 0.7):
+        """
+        Builds the CSR design matrix, z-scoring the numeric columns
+        as PyCaret's normalize=True does, and holds out the same
+        shuffled train/test split as PyCaret's setup.
+        Parameters
+        ----------
+        train_size : Share of rows used for cross validation.
+
+        Returns
+        -------
+        None
+
+        """
+        print("Building Sparse Design Matrix")
+        self.encoder = DesignEncoder(exclude=[self.target]).fit(self.df)
+
+        numeric = self.df[self.encoder.numeric_columns]
+        self.center = numeric.mean().to_numpy()
+        self.scale = numeric.std(ddof=0).replace(0, 1).to_numpy()
+
+        self.design = self.encoder.transform_sparse(self.df, self.center, self.scale)
+        self.y = self.df[self.target].to_numpy(dtype="float64")
+
+        self.train_rows, self.test_rows = train_test_split(
+            np.arange(len(self.df)), train_size=train_size, random_state=self.session_id)
+
+    def train_model(self, model: str = "ridge"):
+        """
+        Train the model with 10-fold cross validation on the train
+        split, with unshuffled folds as in PyCaret's create_model.
+        Returns
+        -------
+        None
+        """
+        print("Training {} Model on Sparse Design Matrix".format(model))
+        self.model = sparse_estimators[model](self.session_id)
+
+        scores = cross_validate(
+            self.model, self.design[self.train_rows], self.y[self.train_rows],
+            cv=KFold(10),
+            scoring={
+                "MAE": "neg_mean_absolute_error",
+                "MSE": "neg_mean_squared_error",
+                "RMSE": "neg_root_mean_squared_error",
+                "R2": "r2",
+            },
+        )
+        self.metrics = pd.DataFrame({
+            metric: -scores["test_{}".format(metric)]
+            for metric in ["MAE", "MSE", "RMSE"]
+        })
+        self.metrics["R2"] = scores["test_R2"]
+        self.metrics.loc["Mean"] = self.metrics.mean()
+        self.metrics.loc["SD"] = self.metrics.iloc[:-1].std(ddof=0)
+
+        print("Model's Metrics:")
+        print(self.metrics.loc["Mean"])
+
+    def finalize_model(self):
+        """
+        Fits the estimator onto the complete sparse design matrix.
+
+        Returns
+        -------
+        None
+        """
+        self.model.fit(self.design, self.y)
+
+    def save_model(self, path: str, model_name: str):
+        """
+        Saves model, encoder and scaling to path.
+        Parameters
+        ----------
+        path : Path to save model.
+        model_name: Model Name.
+        Returns
+        -------
+        None
+        """
+        with open(path + model_name + ".pickle", "wb") as file:
+            pickle.dump((self.encoder, self.center, self.scale, self.model), file)
+
+    def load_model(self, path: str):
+        """
+        Loads the model.
+        Parameters
+        ----------
+        path : Model's path.
+
+        Returns
+        -------
+        Model
+        """
+        with open(path + ".pickle", "rb") as file:
+            self.encoder, self.center, self.scale, self.model = pickle.load(file)
+
+    def predict_model(self, data: pd.DataFrame, target: str = None, export_metrics: bool = False):
+        """
+        Make predictions with unseen data. Rows with missing numeric
+        values receive NaN.
+        Parameters
+        ----------
+        data : The new and unseen data for predictions.
+        target: Target variable for validation evaluation.
+        export_metrics : Checks whether model performance metrics are exported. Validation datasets Only.
+
+        Returns
+        -------
+        pd.DataFrame
+
+        """
+        complete = data[self.encoder.numeric_columns].notnull().all(axis=1).to_numpy()
+        design = self.encoder.transform_sparse(data[complete], self.center, self.scale)
+
+        predict = data.copy()
+        predict["Label"] = np.nan
+        predict.loc[complete, "Label"] = self.model.predict(design)
+
+        if export_metrics:
+            evaluation_metrics(predict, target, export_metrics)
+
+        return predict
+
+    @property
+    def get_model(self):
+        return self.model
+
+
+def compare_backends(df: pd.DataFrame, target: str, model: str = "ridge") -> pd.DataFrame:
+    """
+    Trains the same model with the PyCaret and the sparse backends,
+    reporting design matrix memory, fit time and mean CV metrics of each
+    one. Both cross validate on the same 70% train split and finalize
+    on every row, so times and metrics are comparable.
+
+    Parameters
+    ----------
+    df : Cleaned dataframe for model ingestion.
+    target : Target variable.
+    model : Model from config.models_list.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per backend.
+    """
+    report = {}
+
+    for backend, trainer_class in [("pycaret", RegressorTrainer), ("sparse", SparseRegressorTrainer)]:
+        trainer = trainer_class(df, target, "Backend Comparison")
+
+        start = time.perf_counter()
+        trainer.start_session()
+        trainer.train_model(model)
+        trainer.finalize_model()
+        fit_time = time.perf_counter() - start
+
+        if backend == "pycaret":
+            memory = pcr.get_config("X").memory_usage(deep=True).sum()
+            cv_rows = len(pcr.get_config("X_train"))
+        else:
+            design = trainer.design
+            memory = design.data.nbytes + design.indices.nbytes + design.indptr.nbytes
+            cv_rows = len(trainer.train_rows)
+
+        report[backend] = {
+            "design_memory_mb": memory / 1024 ** 2,
+            "fit_time_s": fit_time,
+            "cv_rows": cv_rows,
+            "final_fit_rows": len(df),
+        }
+        report[backend].update(trainer.metrics.loc["Mean", ["MAE", "MSE", "RMSE", "R2"]].to_dict())
+
+    return pd.DataFrame(report).T
@@ -339,25 +339,116 @@ def preprocess_predict_data(
     return predict_df
 
 
-def preprocess_data(
-        df: pd.DataFrame, df_target: pd.DataFrame
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+def create_pair_features(
+        df_edges: pd.DataFrame, df_person: pd.DataFrame
+) -> pd.DataFrame:
     """
-    Compiles all methods to create the model's dataframe.
+    Creates the pairwise features of each edge directly from the
+    person arrays, gathering V1 and V2 rows by ID instead of joining
+    the full V1 and V2 column sets.
+
+    Parameters
+    ----------
+    df_edges : pd.DataFrame
+        The dataframe with the V1 and V2 connections.
+    df_person : pd.DataFrame
+        Dataframe with one preprocessed row per person.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with the edge variables and the pair features.
+        Pair features are NaN when V1 or V2 is not a known person,
+        and prob_V1_V2 is NaN for unlabeled edges.
+    """
+    person_ids = pd.Index(df_person["name"])
+    if not person_ids.is_unique:
+        raise ValueError("Person IDs in 'name' must be unique.")
+
+    v1_position = person_ids.get_indexer(df_edges["V1"])
+    v2_position = person_ids.get_indexer(df_edges["V2"])
+    missing = (v1_position < 0) | (v2_position < 0)
+
+    edge_columns = ["V1", "V2"] + config.pair_edge_variables + ["prob_V1_V2"]
+    pair_df = df_edges.reindex(columns=edge_columns).reset_index(drop=True)
+
+    for var in config.pair_same_variables:
+        codes, _ = pd.factorize(df_person[var])
+        same = codes[v1_position] == codes[v2_position]
+        pair_df["same_{}".format(var)] = np.where(missing, np.nan, same)
+
+    for var in config.pair_diff_variables:
+        values = df_person[var].to_numpy(dtype="float64")
+        v1_values = np.where(missing, np.nan, values[v1_position])
+        v2_values = np.where(missing, np.nan, values[v2_position])
+        pair_df["{}_V1".format(var)] = v1_values
+        pair_df["{}_V2".format(var)] = v2_values
+        pair_df["abs_diff_{}".format(var)] = np.abs(v1_values - v2_values)
+
+    return pair_df
+
+
+def create_pair_target_dataframe(
+        df_target: pd.DataFrame, df_person: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Creates the model dataframe with pair features, keeping only
+    labeled edges with both persons known.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The dataframe containing individual data.
     df_target : pd.DataFrame
-        DataFrame containing the contamination probability.
+        The dataframe containing the target variable.
+    df_person : pd.DataFrame
+        Dataframe with one preprocessed row per person.
 
     Returns
     -------
     pd.DataFrame
+        Compact dataframe ready for model.
     """
-    utils.create_directories([config.models_path, config.processed_data_path])
+    target = df_target[~df_target["prob_V1_V2"].isnull()]
+
+    return create_pair_features(target, df_person).dropna()
+
 
+def create_pair_predict_dataframe(
+        df_target: pd.DataFrame, df_person: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Creates the dataframe with pair features for target prediction.
+
+    Parameters
+    ----------
+    df_target : pd.DataFrame
+        The dataframe with the target variable.
+    df_person : pd.DataFrame
+        Dataframe with one preprocessed row per person.
+
+    Returns
+    -------
+    pd.DataFrame
+        Compact dataframe for prediction.
+    """
+    predict_df = df_target[df_target["prob_V1_V2"].isnull()]
+
+    return create_pair_features(predict_df, df_person)
+
+
+def preprocess_person_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans and creates the features at individual level.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe containing individual data.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with one preprocessed row per person.
+    """
     df = refactor_counting_missing_variables(
         df, ["qt_filhos"], "filhos")
 
@@ -372,15 +463,58 @@ def preprocess_data(
     df["faixa_etaria"] = create_faixa_etaria_variable(df)
     df["status_IMC"] = create_status_imc_variable(df)
 
+    return df
+
+
+def create_person_dataframes(
+        df: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Creates the V1 and V2 views of the preprocessed individual data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with one preprocessed row per person.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        The V1 and V2 person dataframes.
+    """
     df01 = rename_category(df, "__V1")
     df02 = rename_category(df, "__V2")
 
     df01 = applying_suffix_columns(df01, "_V1")
     df02 = applying_suffix_columns(df02, "_V2")
 
+    return df01, df02
+
+
+def preprocess_data(
+        df: pd.DataFrame, df_target: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Compiles all methods to create the model's dataframe.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe containing individual data.
+    df_target : pd.DataFrame
+        DataFrame containing the contamination probability.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    utils.create_directories([config.models_path, config.processed_data_path])
+
+    df = preprocess_person_data(df)
+    df01, df02 = create_person_dataframes(df)
+
     df_list = [df01, df02]
 
     final_df = create_target_dataframe(df_target, df_list)
 
     return final_df, df01, df02
-
@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict, List
+
+
+class DagScheduler:
+    def __init__(self, name: str = "pipeline"):
+        """
+        Initialize a DAG of pipeline stages.
+        Parameters
+        ----------
+        name : Pipeline name, used in the timing report.
+        """
+        self.name = name
+        self.stages = {}
+        self.dependencies = {}
+        self.results = {}
+        self.timings = {}
+
+    def add_stage(self, name: str, func: Callable, depends_on: List[str] = None):
+        """
+        Declares a stage and the stages it depends on.
+        The stage function receives the results of its dependencies
+        as positional arguments, in the same order as `depends_on`.
+        Parameters
+        ----------
+        name : Stage name.
+        func : Callable executed by the stage.
+        depends_on : Names of the stages that must finish first.
+
+        Returns
+        -------
+        DagScheduler
+        """
+        depends_on = depends_on or []
+
+        if name in self.stages:
+            raise ValueError("Stage '{}' is already declared.".format(name))
+
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(
+                    "Stage '{}' depends on undeclared stage '{}'.".format(name, dependency)
+                )
+
+        self.stages[name] = func
+        self.dependencies[name] = list(depends_on)
+
+        return self
+
+    def run(self, max_workers: int = None, executor: str = "thread") -> Dict[str, object]:
+        """
+        Runs every stage as soon as its dependencies are done,
+        executing independent stages concurrently.
+        Parameters
+        ----------
+        max_workers : Pool size. Uses the executor's default if None.
+        executor : "thread" for a thread pool or "process" for a process pool.
+            Stage functions and results must be picklable for "process".
+
+        Returns
+        -------
+        Dict with the result of each stage.
+        """
+        pools = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+        if executor not in pools:
+            raise ValueError("executor must be one of {}.".format(list(pools)))
+
+        self.results = {}
+        self.timings = {}
+        pending = dict(self.dependencies)
+        running = {}
+        start = time.perf_counter()
+
+        with pools[executor](max_workers=max_workers) as pool:
+            while pending or running:
+                ready = [
+                    stage for stage, deps in pending.items()
+                    if all(dep in self.results for dep in deps)
+                ]
+
+                for stage in ready:
+                    args = [self.results[dep] for dep in pending.pop(stage)]
+                    future = pool.submit(_timed_call, self.stages[stage], args)
+                    running[future] = stage
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage = running.pop(future)
+                    result, stage_start, stage_end = future.result()
+                    self.results[stage] = result
+                    self.timings[stage] = (stage_start - start, stage_end - start)
+
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        """
+        Computes the chain of dependent stages with the largest
+        accumulated duration on the last run.
+        Returns
+        -------
+        List of stage names, from first to last.
+        """
+        if not self.timings:
+            return []
+
+        cost = {}
+        previous = {}
+
+        # Stages are declared after their dependencies, so the
+        # declaration order is already a topological order.
+        for stage in self.stages:
+            duration = self.timings[stage][1] - self.timings[stage][0]
+            deps = self.dependencies[stage]
+            best = max(deps, key=lambda dep: cost[dep], default=None)
+            cost[stage] = duration + (cost[best] if best else 0.0)
+            previous[stage] = best
+
+        stage = max(cost, key=cost.get)
+        path = []
+        while stage:
+            path.append(stage)
+            stage = previous[stage]
+
+        return path[::-1]
+
+    def timing_report(self) -> str:
+        """
+        Builds a report with the duration of each stage and
+        the pipeline's critical path.
+        Returns
+        -------
+        str
+        """
+        lines = ["{} timing report:".format(self.name)]
+
+        for stage, (stage_start, stage_end) in sorted(self.timings.items(), key=lambda item: item[1]):
+            lines.append(
+                "  {:<24} start {:>8.2f}s  duration {:>8.2f}s".format(
+                    stage, stage_start, stage_end - stage_start)
+            )
+
+        path = self.critical_path()
+        if path:
+            path_duration = sum(self.timings[s][1] - self.timings[s][0] for s in path)
+            wall_time = max(end for _, end in self.timings.values())
+            lines.append("Critical path ({:.2f}s): {}".format(path_duration, " -> ".join(path)))
+            lines.append("Wall time: {:.2f}s".format(wall_time))
+
+        return "\n".join(lines)
+
+
+def _timed_call(func: Callable, args: list):
+    """
+    Runs a stage function, recording its start and end times.
+    Kept at module level so process pools can pickle it.
+    """
+    stage_start = time.perf_counter()
+    result = func(*args)
+    return result, stage_start, time.perf_counter()
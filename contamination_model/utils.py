@@ -1,10 +1,14 @@
 import os
+import pickle
+import numpy as np
 import pandas as pd
-import seaborn as sns
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.ndimage import gaussian_filter1d
 
 
-def plot_configuration(x: float = 11.7, y: float = 8.27) -> None:
+def plot_configuration(x: float = 11.7, y: float = 8.27, headless: bool = False) -> tuple:
     """
     Fixed configuration for seaborn plots.
 
@@ -14,9 +18,192 @@ def plot_configuration(x: float = 11.7, y: float = 8.27) -> None:
         The plot's X-axis, by default 11.7
     y : float, optional
         The plot's X-axis, by default 8.27
+    headless : bool, optional
+        Draws on a standalone Agg canvas, for batch exports without a
+        display. Pyplot's backend and figure list are left untouched,
+        by default False
+
+    Returns
+    -------
+    tuple
+        The matplotlib figure and axes.
     """
     a4_dims = (x, y)
-    plt.subplots(figsize=a4_dims)
+
+    if headless:
+        fig = Figure(figsize=a4_dims)
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots()
+
+    return plt.subplots(figsize=a4_dims)
+
+
+def sample_per_category(
+        df: pd.DataFrame, column: str, sample_size: int, random_state: int = 16
+) -> pd.DataFrame:
+    """
+    Uniform sample without replacement of up to `sample_size` rows per
+    category, drawn in a single pass by ranking random keys within
+    each category.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A dataframe with a category column.
+    column : str
+        The category column.
+    sample_size : int
+        Maximum number of rows per category.
+    random_state : int, optional
+        Sampling random state, by default 16
+
+    Returns
+    -------
+    pd.DataFrame
+        The sampled dataframe.
+    """
+    keys = pd.Series(np.random.default_rng(random_state).random(len(df)), index=df.index)
+    rank = keys.groupby(df[column]).rank(method="first")
+
+    return df[rank <= sample_size]
+
+
+def category_histograms(
+        df: pd.DataFrame,
+        column: str,
+        target: str = "prob_V1_V2",
+        bins: int = 50,
+        sample_size: int = None
+) -> tuple:
+    """
+    Binned counts of the target for every category, computed with a
+    single groupby over shared bin edges.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A dataframe with a category column.
+    column : str
+        The category column.
+    target : str, optional
+        The variable to summarize, by default "prob_V1_V2"
+    bins : int, optional
+        Number of bins, by default 50
+    sample_size : int, optional
+        Summarizes a sample of up to this many rows per category,
+        by default None, using every row.
+
+    Returns
+    -------
+    tuple
+        The bin edges and a dataframe of counts, one row per category.
+    """
+    data = df[[column, target]].dropna()
+    if sample_size is not None:
+        data = sample_per_category(data, column, sample_size)
+
+    edges = np.histogram_bin_edges(data[target], bins=bins)
+    bin_index = np.digitize(data[target], edges[1:-1])
+
+    counts = (
+        data.groupby([data[column], bin_index]).size()
+        .unstack(fill_value=0)
+        .reindex(columns=range(bins), fill_value=0)
+    )
+
+    return edges, counts
+
+
+def binned_density(counts: pd.DataFrame, edges: np.ndarray, kind: str = "kde") -> pd.DataFrame:
+    """
+    Turns binned counts into densities. For "kde", the counts are
+    smoothed with a gaussian kernel, using Scott's bandwidth estimated
+    from the binned data.
+
+    Parameters
+    ----------
+    counts : pd.DataFrame
+        Counts per category and bin.
+    edges : np.ndarray
+        The bin edges.
+    kind : str, optional
+        "kde" or "hist", by default "kde"
+
+    Returns
+    -------
+    pd.DataFrame
+        Densities per category and bin.
+    """
+    width = np.diff(edges)[0]
+    centers = (edges[:-1] + edges[1:]) / 2
+    densities = {}
+
+    for category, row in counts.iterrows():
+        values = row.to_numpy(dtype="float64")
+        total = values.sum()
+
+        if kind == "kde" and total > 1:
+            mean = (values * centers).sum() / total
+            std = np.sqrt((values * (centers - mean) ** 2).sum() / total)
+            sigma = max(std * total ** (-1 / 5) / width, 0.5)
+            values = gaussian_filter1d(values, sigma, mode="constant")
+
+        densities[category] = values / (max(total, 1) * width)
+
+    return pd.DataFrame(densities, index=centers).T
+
+
+def plot_category_distributions(
+        df: pd.DataFrame,
+        column: str,
+        target: str = "prob_V1_V2",
+        kind: str = "kde",
+        bins: int = 50,
+        sample_size: int = None,
+        ax=None
+):
+    """
+    Distribution Plot for the selected column, by category, rendered
+    from precomputed binned summaries.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A dataframe with a category column.
+    column : str
+        The category column for plotting.
+    target : str, optional
+        The variable to plot, by default "prob_V1_V2"
+    kind : str, optional
+        "kde" or "hist", by default "kde"
+    bins : int, optional
+        Number of bins, by default 50
+    sample_size : int, optional
+        Maximum number of rows per category, by default None
+    ax : optional
+        Matplotlib axes, by default the current axes.
+
+    Returns
+    -------
+    The matplotlib axes.
+    """
+    ax = ax or plt.gca()
+
+    edges, counts = category_histograms(df, column, target, bins, sample_size)
+    densities = binned_density(counts, edges, kind)
+
+    for category, density in densities.iterrows():
+        if kind == "hist":
+            ax.step(density.index, density.values, where="mid", label=category)
+        else:
+            ax.plot(density.index, density.values, label=category)
+
+    ax.set_xlabel(target)
+    ax.set_ylabel("Density")
+    ax.set_title(column)
+    ax.legend()
+
+    return ax
 
 
 def plotting_categories(df: pd.DataFrame, column: str) -> None:
@@ -31,11 +218,56 @@ def plotting_categories(df: pd.DataFrame, column: str) -> None:
     column : str
         The category column for plotting.
     """
-    categories = df[column].unique()
+    plot_category_distributions(df, column, kind="kde")
 
-    for category in categories:
-        series_to_plot = df[df[column] == category]['prob_V1_V2']
-        sns.distplot(series_to_plot, hist=False, label=category)
+
+def export_category_plots(
+        df: pd.DataFrame,
+        columns: list,
+        output_dir: str,
+        target: str = "prob_V1_V2",
+        kind: str = "kde",
+        bins: int = 50,
+        sample_size: int = None
+) -> list:
+    """
+    Exports the distribution plot of every category column to
+    `output_dir`, without a display.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        A dataframe with category columns.
+    columns : list
+        The category columns for plotting.
+    output_dir : str
+        Directory for the png files.
+    target : str, optional
+        The variable to plot, by default "prob_V1_V2"
+    kind : str, optional
+        "kde" or "hist", by default "kde"
+    bins : int, optional
+        Number of bins, by default 50
+    sample_size : int, optional
+        Maximum number of rows per category, by default None
+
+    Returns
+    -------
+    list
+        Paths of the exported plots.
+    """
+    create_directories([output_dir])
+    paths = []
+
+    for column in columns:
+        fig, ax = plot_configuration(headless=True)
+        plot_category_distributions(df, column, target, kind, bins, sample_size, ax=ax)
+
+        path = os.path.join(output_dir, "{}.png".format(column))
+        fig.savefig(path, bbox_inches="tight")
+        paths.append(path)
+
+    return paths
 
 
 def create_directories(directories_list: list) -> None:
@@ -54,3 +286,21 @@ def create_directories(directories_list: list) -> None:
             os.mkdir(directory)
         except FileExistsError:
             pass
+
+
+def save_pickle(data: object, path: str) -> str:
+    """
+    Pickles an object to path.
+    Parameters
+    ----------
+    data : Object to be saved.
+    path : Destination file path.
+
+    Returns
+    -------
+    The destination file path.
+    """
+    with open(path, "wb") as file:
+        pickle.dump(data, file)
+
+    return path
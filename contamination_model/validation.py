@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+from pandas.api import types
+from contamination_model import config
+
+dtype_checks = {
+    "int": types.is_integer_dtype,
+    "float": types.is_numeric_dtype,
+    "object": lambda dtype: types.is_object_dtype(dtype) or types.is_string_dtype(dtype),
+}
+
+
+class DataValidationError(ValueError):
+    """ Raised by fail-fast validation on the first failed check. """
+
+
+def check_schema(df: pd.DataFrame, schema: dict) -> tuple:
+    """
+    Checks that every schema column exists with the expected dtype.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw dataframe.
+    schema : dict
+        Column name to "int", "float" or "object".
+
+    Returns
+    -------
+    tuple
+        Number of failed columns and their description.
+    """
+    failures = []
+
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            failures.append("{} missing".format(column))
+        elif not dtype_checks[dtype](df[column].dtype):
+            failures.append("{} is {}, expected {}".format(column, df[column].dtype, dtype))
+
+    return len(failures), "; ".join(failures)
+
+
+def check_range(series: pd.Series, lower: float, upper: float) -> tuple:
+    """
+    Counts non-null values outside the closed interval [lower, upper].
+
+    Parameters
+    ----------
+    series : pd.Series
+        Numeric values.
+    lower : float
+        Lowest valid value.
+    upper : float
+        Highest valid value.
+
+    Returns
+    -------
+    tuple
+        Number of values out of range or not numeric, and the
+        observed min/max.
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    outside = (values < lower) | (values > upper) | (values.isnull() & series.notnull())
+
+    return int(outside.sum()), "expected [{}, {}], observed [{}, {}]".format(
+        lower, upper, values.min(), values.max())
+
+
+def check_domain(series: pd.Series, domain: list) -> tuple:
+    """
+    Counts non-null values outside the allowed domain.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Values to check.
+    domain : list
+        Allowed values.
+
+    Returns
+    -------
+    tuple
+        Number of invalid values and the invalid values found.
+    """
+    invalid = series.notnull() & ~series.isin(domain)
+
+    return int(invalid.sum()), "invalid values: {}".format(series[invalid].unique()[:5].tolist())
+
+
+def check_references(ids: pd.Series, valid_ids: pd.Series) -> tuple:
+    """
+    Counts IDs that do not exist among the valid IDs.
+
+    Parameters
+    ----------
+    ids : pd.Series
+        Referencing IDs.
+    valid_ids : pd.Series
+        Referenced IDs.
+
+    Returns
+    -------
+    tuple
+        Number of dangling references and a few examples.
+    """
+    dangling = ~ids.isin(valid_ids)
+
+    return int(dangling.sum()), "unknown IDs: {}".format(ids[dangling].unique()[:5].tolist())
+
+
+def input_checks(df: pd.DataFrame, df_target: pd.DataFrame) -> list:
+    """
+    Declares the checks on the raw individuals and connections data,
+    in execution order. Each check lists the columns it needs and is
+    skipped if any of them is missing.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe containing individual data.
+    df_target : pd.DataFrame
+        DataFrame containing the contamination probability.
+
+    Returns
+    -------
+    list
+        Tuples of dataset, check name, severity, required columns and
+        a callable returning (n_failed, detail).
+    """
+    checks = [
+        ("individuos", "schema", "error", [],
+         lambda: check_schema(df, config.individuals_schema)),
+        ("conexoes", "schema", "error", [],
+         lambda: check_schema(df_target, config.connections_schema)),
+        ("individuos", "name_not_null", "error", ["name"],
+         lambda: (int(df["name"].isnull().sum()), "")),
+        ("individuos", "name_unique", "error", ["name"],
+         lambda: (int(df["name"].duplicated().sum()), "duplicated person IDs")),
+        ("conexoes", "ids_not_null", "error", ["V1", "V2"],
+         lambda: (int(df_target[["V1", "V2"]].isnull().any(axis=1).sum()), "")),
+        ("conexoes", "V1_references_name", "error", ["V1", "name"],
+         lambda: check_references(df_target["V1"], df["name"])),
+        ("conexoes", "V2_references_name", "error", ["V2", "name"],
+         lambda: check_references(df_target["V2"], df["name"])),
+        ("conexoes", "prob_V1_V2_range", "error", ["prob_V1_V2"],
+         lambda: check_range(df_target["prob_V1_V2"], 0, 1)),
+        ("conexoes", "self_loops", "warning", ["V1", "V2"],
+         lambda: (int((df_target["V1"] == df_target["V2"]).sum()), "edges with V1 == V2")),
+    ]
+
+    for column, (lower, upper) in config.value_ranges.items():
+        checks.append(("individuos", "{}_range".format(column), "error", [column],
+                       lambda column=column, lower=lower, upper=upper: check_range(df[column], lower, upper)))
+
+    for column in config.binary_variables:
+        checks.append(("individuos", "{}_domain".format(column), "error", [column],
+                       lambda column=column: check_domain(df[column], [0, 1])))
+
+    checks.append(("individuos", "missing_values", "warning", [],
+                   lambda: (int(df.isnull().sum().sum()), "imputed downstream; per column: {}".format(
+                       df.isnull().sum()[lambda counts: counts > 0].to_dict()))))
+
+    return checks
+
+
+def validate_inputs(df: pd.DataFrame, df_target: pd.DataFrame, fail_fast: bool = False) -> pd.DataFrame:
+    """
+    Runs the data-quality checks on the raw inputs right after load.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe containing individual data.
+    df_target : pd.DataFrame
+        DataFrame containing the contamination probability.
+    fail_fast : bool, optional
+        Raises DataValidationError on the first failed error check,
+        skipping the remaining ones, by default False
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per check with its status and number of failures.
+    """
+    available = set(df.columns) | set(df_target.columns)
+    report = []
+
+    for dataset, name, severity, columns, check in input_checks(df, df_target):
+        if not available.issuperset(columns):
+            report.append((dataset, name, severity, "skipped", np.nan, "missing columns"))
+            continue
+
+        n_failed, detail = check()
+        status = "passed" if n_failed == 0 else "failed"
+        report.append((dataset, name, severity, status, n_failed, detail if n_failed else ""))
+
+        if fail_fast and status == "failed" and severity == "error":
+            raise DataValidationError("{}.{} failed for {} rows: {}".format(dataset, name, n_failed, detail))
+
+    return pd.DataFrame(report, columns=["dataset", "check", "severity", "status", "n_failed", "detail"])
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from contamination_model import preprocess
+
+
+@pytest.fixture
+def df_individuals() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 120
+
+    return pd.DataFrame({
+        "name": np.arange(1, n + 1),
+        "idade": rng.uniform(5, 90, n),
+        "estado_civil": rng.choice(["solteiro", "casado", "divorciado", None], n),
+        "qt_filhos": rng.choice([0, 1, 2, np.nan], n),
+        "estuda": rng.choice([0, 1, np.nan], n),
+        "trabalha": rng.choice([0, 1, np.nan], n),
+        "pratica_esportes": rng.choice([0, 1, np.nan], n),
+        "transporte_mais_utilizado": rng.choice(["taxi", "onibus", "carro", None], n),
+        "IMC": rng.uniform(15, 45, n),
+    })
+
+
+@pytest.fixture
+def df_connections() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    m = 600
+
+    df_target = pd.DataFrame({
+        "V1": rng.integers(1, 124, m),
+        "V2": rng.integers(1, 124, m),
+        "grau": rng.choice(["familia", "amigos", "trabalho"], m),
+        "proximidade": rng.choice(["visita_rara", "frequente", "mora_junto"], m),
+        "prob_V1_V2": rng.uniform(0, 1, m),
+    })
+    df_target.loc[df_target.index % 5 == 0, "prob_V1_V2"] = np.nan
+
+    return df_target
+
+
+@pytest.fixture
+def df_person(df_individuals) -> pd.DataFrame:
+    return preprocess.preprocess_person_data(df_individuals)
+
+
+@pytest.fixture
+def df_train(df_person, df_connections) -> pd.DataFrame:
+    df_v1, df_v2 = preprocess.create_person_dataframes(df_person)
+
+    return preprocess.create_target_dataframe(df_connections, [df_v1, df_v2])
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from contamination_model.encoding import DesignEncoder
+
+
+@pytest.fixture
+def encoder(df_train) -> DesignEncoder:
+    return DesignEncoder(exclude=["V1", "V2", "prob_V1_V2"]).fit(df_train)
+
+
+def test_transform_sparse_matches_dense_transform(encoder, df_train):
+    dense = encoder.transform(df_train)
+    n_numeric = len(encoder.numeric_columns)
+    center = dense[:, :n_numeric].mean(axis=0)
+    scale = dense[:, :n_numeric].std(axis=0)
+
+    design = encoder.transform_sparse(df_train, center, scale)
+
+    expected = dense.copy()
+    expected[:, :n_numeric] = (expected[:, :n_numeric] - center) / scale
+    assert design.shape == (len(df_train), len(encoder.feature_names))
+    np.testing.assert_allclose(design.toarray(), expected)
+
+
+def test_unseen_categories_are_all_zero(encoder, df_train):
+    df = df_train.iloc[:3].assign(grau="desconhecido")
+
+    design = encoder.transform_sparse(df).toarray()
+    grau_columns = [position for position, name in enumerate(encoder.feature_names) if name.startswith("grau")]
+
+    np.testing.assert_array_equal(design[:, grau_columns], 0)
+    np.testing.assert_array_equal(design, encoder.transform(df))
+
+
+def test_missing_numeric_values_raise(encoder, df_train):
+    df = df_train.iloc[:3].copy()
+    df.loc[df.index[0], "idade_V1"] = np.nan
+
+    with pytest.raises(ValueError):
+        encoder.transform_sparse(df)
+    with pytest.raises(ValueError):
+        encoder.transform(df)
+
+
+def test_sparse_trainer_round_trip(tmp_path, df_train):
+    modelling = pytest.importorskip("contamination_model.modelling")
+    df = df_train.drop(["V1", "V2"], axis=1)
+
+    trainer = modelling.SparseRegressorTrainer(df, "prob_V1_V2", "test")
+    trainer.start_session()
+    trainer.train_model()
+    trainer.finalize_model()
+    trainer.save_model(str(tmp_path), "/model")
+
+    loaded = modelling.SparseRegressorTrainer(df, "prob_V1_V2", "test")
+    loaded.load_model(str(tmp_path) + "/model")
+    predictions = loaded.predict_model(df)
+
+    assert len(trainer.train_rows) == int(len(df) * 0.7)
+    assert list(trainer.metrics.index[-2:]) == ["Mean", "SD"]
+    np.testing.assert_allclose(predictions["Label"], trainer.model.predict(trainer.design))
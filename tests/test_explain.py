@@ -0,0 +1,55 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from contamination_model import config, explain, incremental
+
+
+@pytest.fixture
+def engine(tmp_path, df_train, monkeypatch) -> explain.AttributionEngine:
+    monkeypatch.setattr(config, "MODEL_STATE_PATH", str(tmp_path / "model_state.pickle"))
+    monkeypatch.setattr(config, "EXPLAIN_BACKGROUND_PATH", str(tmp_path / "explain_background.pickle"))
+
+    state = incremental.IncrementalLinearModel("ridge").partial_fit(df_train)
+    with open(config.MODEL_STATE_PATH, "wb") as file:
+        pickle.dump(state, file)
+
+    engine = explain.AttributionEngine("incremental")
+    engine.fit_background(df_train, size=100)
+
+    return engine
+
+
+def test_attributions_add_up_to_prediction(engine, df_train):
+    explanation = engine.explain(df_train)
+    attributions = explanation.drop(["V1", "V2"], axis=1).sum(axis=1)
+
+    np.testing.assert_allclose(engine.expected_value + attributions, engine.estimator.predict(df_train))
+    np.testing.assert_array_equal(explanation[["V1", "V2"]], df_train[["V1", "V2"]])
+
+
+def test_background_is_cached(engine, df_train):
+    cached = explain.AttributionEngine("incremental")
+    cached.fit_background(df_train.iloc[:0])
+
+    np.testing.assert_array_equal(cached.background, engine.background)
+    assert cached.feature_names == engine.feature_names
+
+
+def test_explain_to_disk_matches_explain(engine, df_train, tmp_path):
+    path = str(tmp_path / "attributions.csv")
+
+    global_attributions = engine.explain_to_disk(df_train, path, chunk_size=100)
+    expected = engine.explain(df_train).drop(["V1", "V2"], axis=1)
+
+    np.testing.assert_allclose(pd.read_csv(path).drop(["V1", "V2"], axis=1), expected)
+    np.testing.assert_allclose(global_attributions["mean_abs_attribution"], expected.abs().mean()[global_attributions.index])
+
+
+def test_explain_to_disk_handles_empty_frames(engine, df_train, tmp_path):
+    path = str(tmp_path / "attributions.csv")
+
+    global_attributions = engine.explain_to_disk(df_train.iloc[:0], path)
+
+    assert global_attributions.empty
+    assert list(pd.read_csv(path).columns) == ["V1", "V2"] + engine.feature_names
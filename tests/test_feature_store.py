@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from contamination_model import feature_store, preprocess
+
+
+def test_write_and_read_round_trip(tmp_path, df_person, df_connections):
+    path = str(tmp_path / "feature_store.bin")
+    feature_store.write_feature_store(df_person, path)
+
+    store = feature_store.FeatureStore(path)
+    person = store.person_frame(df_person["name"])
+
+    assert store.version == 1
+    pd.testing.assert_frame_equal(person, df_person.reset_index(drop=True), check_dtype=False)
+
+    df_v1, df_v2 = preprocess.create_person_dataframes(df_person)
+    expected = preprocess.preprocess_predict_data(df_connections, df_v1, df_v2)
+    df_edges = df_connections[df_connections["prob_V1_V2"].isnull()]
+    pd.testing.assert_frame_equal(store.edge_frame(df_edges), expected, check_dtype=False)
+
+
+def test_unknown_ids_get_nan(tmp_path, df_person):
+    path = str(tmp_path / "feature_store.bin")
+    feature_store.write_feature_store(df_person, path)
+
+    person = feature_store.FeatureStore(path).person_frame([-5, 10 ** 6])
+
+    assert person.drop("name", axis=1).isnull().all().all()
+
+
+def test_refresh_loads_new_version(tmp_path, df_person):
+    path = str(tmp_path / "feature_store.bin")
+    feature_store.write_feature_store(df_person, path)
+    store = feature_store.FeatureStore(path)
+
+    assert not store.refresh()
+
+    updated = df_person.assign(idade=df_person["idade"] + 1)
+    feature_store.write_feature_store(updated, path)
+
+    assert store.refresh()
+    assert store.version == 2
+    np.testing.assert_allclose(store.person_frame([1])["idade"], updated["idade"].iloc[:1])
+
+
+def test_swap_between_header_read_and_mapping(tmp_path, df_person, monkeypatch):
+    path = str(tmp_path / "feature_store.bin")
+    feature_store.write_feature_store(df_person, path)
+
+    larger = pd.concat([df_person, df_person.assign(name=df_person["name"] + 1000)])
+    read_header = feature_store._read_header
+
+    def read_header_then_swap(file):
+        header = read_header(file)
+        monkeypatch.setattr(feature_store, "_read_header", read_header)
+        feature_store.write_feature_store(larger, path)
+        return header
+
+    monkeypatch.setattr(feature_store, "_read_header", read_header_then_swap)
+    store = feature_store.FeatureStore(path)
+
+    assert store.version == 1
+    assert feature_store.read_header(path)["version"] == 2
+    assert store.matrix.shape[0] == len(df_person)
+    np.testing.assert_allclose(store.person_frame([1, 2, 3])["idade"], df_person["idade"].iloc[:3])
+
+
+def test_lookup_matches_edge_frame(tmp_path, df_person):
+    path = str(tmp_path / "feature_store.bin")
+    feature_store.write_feature_store(df_person, path)
+    store = feature_store.FeatureStore(path)
+
+    for v1, v2 in [(1, 2), (7, 1), (3, 10 ** 6)]:
+        expected = store.edge_frame(pd.DataFrame({"V1": [v1], "V2": [v2]})).iloc[0]
+        pd.testing.assert_series_equal(pd.Series(store.lookup(v1, v2)), expected, check_names=False, check_dtype=False)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from contamination_model import config, incremental
+
+estimators = {
+    "lr": lambda params: LinearRegression(),
+    "ridge": lambda params: Ridge(**params),
+    "lasso": lambda params: Lasso(tol=1e-10, max_iter=100000, **params),
+    "en": lambda params: ElasticNet(tol=1e-10, max_iter=100000, **params),
+}
+small_params = {
+    "lr": {},
+    "ridge": {"alpha": 1.0},
+    "lasso": {"alpha": 0.001},
+    "en": {"alpha": 0.001, "l1_ratio": 0.5},
+}
+
+
+@pytest.fixture
+def df_repeated(df_train) -> pd.DataFrame:
+    # Repeated (V1, V2) pairs with other labels are regular training rows.
+    repeated = df_train.iloc[:10].assign(prob_V1_V2=lambda df: 1 - df["prob_V1_V2"])
+    return pd.concat([df_train, repeated], ignore_index=True)
+
+
+@pytest.mark.parametrize("model", ["lr", "ridge"])
+def test_matches_scikit_learn(model, df_repeated, monkeypatch):
+    monkeypatch.setitem(config.incremental_model_params, model, small_params[model])
+    state = incremental.IncrementalLinearModel(model).partial_fit(df_repeated)
+
+    design = (state.encoder.transform(df_repeated) - state.center_) / state.scale_
+    estimator = estimators[model](small_params[model]).fit(design, df_repeated["prob_V1_V2"])
+
+    assert state.n_samples == len(df_repeated)
+    np.testing.assert_allclose(state.coef_, estimator.coef_, atol=1e-8)
+    np.testing.assert_allclose(state.predict(df_repeated), estimator.predict(design), atol=1e-8)
+
+
+@pytest.mark.parametrize("model", ["lasso", "en"])
+def test_reaches_scikit_learn_objective(model, df_repeated, monkeypatch):
+    params = small_params[model]
+    monkeypatch.setitem(config.incremental_model_params, model, params)
+    state = incremental.IncrementalLinearModel(model).partial_fit(df_repeated)
+
+    design = (state.encoder.transform(df_repeated) - state.center_) / state.scale_
+    y = df_repeated["prob_V1_V2"].to_numpy()
+    estimator = estimators[model](params).fit(design, y)
+
+    def objective(coef, intercept):
+        l1_ratio = params.get("l1_ratio", 1.0)
+        residual = y - design @ coef - intercept
+        penalty = l1_ratio * np.abs(coef).sum() + (1 - l1_ratio) / 2 * coef @ coef
+        return residual @ residual / (2 * len(y)) + params["alpha"] * penalty
+
+    assert objective(state.coef_, state.intercept_) == pytest.approx(
+        objective(estimator.coef_, estimator.intercept_), rel=1e-6)
+
+
+def test_batches_match_single_fit(df_train):
+    half = len(df_train) // 2
+    single = incremental.IncrementalLinearModel("ridge").partial_fit(df_train)
+    batches = incremental.IncrementalLinearModel("ridge").partial_fit(df_train.iloc[:half])
+    batches.partial_fit(df_train.iloc[half:])
+
+    np.testing.assert_allclose(batches.coef_, single.coef_)
+    np.testing.assert_allclose(batches.intercept_, single.intercept_)
+
+
+def test_update_relabels_previous_updates(df_train):
+    edges = pd.Series(list(zip(df_train["V1"], df_train["V2"])))
+    base = df_train.iloc[:300]
+    new = df_train[~edges.isin(edges[:300]).to_numpy()].drop_duplicates(["V1", "V2"])
+    relabeled = new.iloc[:20].assign(prob_V1_V2=lambda df: 1 - df["prob_V1_V2"])
+
+    state = incremental.IncrementalLinearModel("ridge").partial_fit(base)
+    state.update(new)
+    state.update(pd.concat([relabeled, new.iloc[20:40]]))
+
+    expected = incremental.IncrementalLinearModel("ridge").partial_fit(base)
+    expected.partial_fit(pd.concat([relabeled, new.iloc[20:]]))
+
+    assert (state.n_added, state.n_relabeled, state.n_skipped) == (0, 20, 20)
+    np.testing.assert_allclose(state.coef_, expected.coef_)
+    np.testing.assert_allclose(state.intercept_, expected.intercept_)
+
+
+def test_update_skips_refit_edges_and_counts_conflicts(df_train):
+    state = incremental.IncrementalLinearModel("ridge").partial_fit(df_train)
+    coef = state.coef_.copy()
+
+    batch = df_train.drop_duplicates(["V1", "V2"], keep="last").iloc[:10]
+    batch = batch.assign(prob_V1_V2=np.r_[1 - batch["prob_V1_V2"].iloc[:4], batch["prob_V1_V2"].iloc[4:]])
+    state.update(batch)
+
+    assert (state.n_added, state.n_skipped, state.n_conflicts) == (0, 10, 4)
+    np.testing.assert_array_equal(state.coef_, coef)
+
+
+def test_drift_is_zero_after_refit(df_train):
+    state = incremental.IncrementalLinearModel("ridge").partial_fit(df_train)
+
+    assert state.drift() == 0
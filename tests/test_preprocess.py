@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from contamination_model import config, preprocess
+
+
+def test_pair_features_match_wide_join(df_connections, df_person, df_train):
+    df_pair = preprocess.create_pair_target_dataframe(df_connections, df_person)
+
+    pd.testing.assert_frame_equal(
+        df_pair[["V1", "V2", "prob_V1_V2"]].reset_index(drop=True),
+        df_train[["V1", "V2", "prob_V1_V2"]].reset_index(drop=True),
+    )
+    df_pair, df_train = df_pair.reset_index(drop=True), df_train.reset_index(drop=True)
+
+    for var in config.pair_same_variables:
+        v1 = df_train["{}_V1".format(var)].str.replace("__V1", "", regex=False)
+        v2 = df_train["{}_V2".format(var)].str.replace("__V2", "", regex=False)
+        np.testing.assert_array_equal(df_pair["same_{}".format(var)], v1 == v2)
+
+    for var in config.pair_diff_variables:
+        for side in ["V1", "V2"]:
+            column = "{}_{}".format(var, side)
+            np.testing.assert_allclose(df_pair[column], df_train[column])
+        np.testing.assert_allclose(
+            df_pair["abs_diff_{}".format(var)], (df_train[var + "_V1"] - df_train[var + "_V2"]).abs())
+
+
+def test_pair_predict_dataframe_keeps_unknown_persons(df_connections, df_person):
+    df_predict = preprocess.create_pair_predict_dataframe(df_connections, df_person)
+    unlabeled = df_connections[df_connections["prob_V1_V2"].isnull()]
+    unknown = ~(unlabeled["V1"].isin(df_person["name"]) & unlabeled["V2"].isin(df_person["name"]))
+
+    assert len(df_predict) == len(unlabeled)
+    assert df_predict["prob_V1_V2"].isnull().all()
+    np.testing.assert_array_equal(df_predict["abs_diff_idade"].isnull(), unknown)
+
+
+def test_pair_features_accept_unlabeled_edges(df_connections, df_person):
+    edges = df_connections[["V1", "V2"]]
+
+    df_pair = preprocess.create_pair_features(edges, df_person)
+
+    assert len(df_pair) == len(edges)
+    assert df_pair["prob_V1_V2"].isnull().all()
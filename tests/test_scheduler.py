@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from contamination_model import scheduler
+
+
+def test_runs_stages_after_their_dependencies():
+    dag = scheduler.DagScheduler()
+    dag.add_stage("a", lambda: 1)
+    dag.add_stage("b", lambda a: a + 1, ["a"])
+    dag.add_stage("c", lambda a: a * 10, ["a"])
+    dag.add_stage("d", lambda b, c: (b, c), ["b", "c"])
+
+    results = dag.run(max_workers=2)
+
+    assert results == {"a": 1, "b": 2, "c": 10, "d": (2, 10)}
+    for stage, deps in dag.dependencies.items():
+        for dep in deps:
+            assert dag.timings[dep][1] <= dag.timings[stage][0]
+
+
+def test_runs_independent_stages_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    dag = scheduler.DagScheduler()
+    dag.add_stage("left", barrier.wait)
+    dag.add_stage("right", barrier.wait)
+
+    dag.run(max_workers=2)
+
+    assert set(dag.results) == {"left", "right"}
+
+
+def test_rejects_duplicate_and_undeclared_stages():
+    dag = scheduler.DagScheduler().add_stage("a", lambda: 1)
+
+    with pytest.raises(ValueError):
+        dag.add_stage("a", lambda: 2)
+    with pytest.raises(ValueError):
+        dag.add_stage("b", lambda x: x, ["missing"])
+    with pytest.raises(ValueError):
+        dag.run(executor="fiber")
+
+
+def test_propagates_stage_errors():
+    def fail(value):
+        raise KeyError("stage failed")
+
+    dag = scheduler.DagScheduler()
+    dag.add_stage("a", lambda: 1)
+    dag.add_stage("b", fail, ["a"])
+    dag.add_stage("c", lambda b: b, ["b"])
+
+    with pytest.raises(KeyError, match="stage failed"):
+        dag.run(max_workers=2)
+    assert "c" not in dag.results
+
+
+def test_critical_path_follows_slowest_chain():
+    dag = scheduler.DagScheduler("pipeline")
+    dag.add_stage("load", lambda: time.sleep(0.01))
+    dag.add_stage("fast", lambda _: None, ["load"])
+    dag.add_stage("slow", lambda _: time.sleep(0.2), ["load"])
+    dag.add_stage("save", lambda fast, slow: None, ["fast", "slow"])
+
+    dag.run(max_workers=2)
+
+    assert dag.critical_path() == ["load", "slow", "save"]
+    assert "Critical path" in dag.timing_report()
+
+
+def test_process_executor():
+    dag = scheduler.DagScheduler()
+    dag.add_stage("a", _one)
+    dag.add_stage("b", float, ["a"])
+
+    assert dag.run(max_workers=2, executor="process") == {"a": 1, "b": 1.0}
+
+
+def _one():
+    return 1
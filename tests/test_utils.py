@@ -0,0 +1,40 @@
+import os
+import matplotlib.pyplot as plt
+import numpy as np
+from contamination_model import utils
+
+
+def test_category_histograms_match_numpy(df_train):
+    edges, counts = utils.category_histograms(df_train, "grau", bins=20)
+
+    for category, row in counts.iterrows():
+        values = df_train.loc[df_train["grau"] == category, "prob_V1_V2"]
+        np.testing.assert_array_equal(row, np.histogram(values, bins=edges)[0])
+
+
+def test_sample_per_category_caps_each_category(df_train):
+    sample = utils.sample_per_category(df_train, "grau", 30)
+
+    assert sample["grau"].value_counts().max() <= 30
+    assert set(sample["grau"]) == set(df_train["grau"])
+
+
+def test_binned_density_integrates_to_one(df_train):
+    edges, counts = utils.category_histograms(df_train, "proximidade", bins=20)
+    width = np.diff(edges)[0]
+
+    hist = utils.binned_density(counts, edges, "hist")
+    kde = utils.binned_density(counts, edges, "kde")
+
+    np.testing.assert_allclose(hist.sum(axis=1) * width, 1)
+    # The kernel spills some mass past the outer bins.
+    assert ((kde.sum(axis=1) * width).between(0.8, 1)).all()
+
+
+def test_export_category_plots_leaves_pyplot_alone(df_train, tmp_path):
+    backend, figures = plt.get_backend(), plt.get_fignums()
+
+    paths = utils.export_category_plots(df_train, ["grau", "proximidade"], str(tmp_path), bins=20)
+
+    assert all(os.path.getsize(path) > 0 for path in paths)
+    assert (plt.get_backend(), plt.get_fignums()) == (backend, figures)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from contamination_model import validation
+
+
+@pytest.fixture
+def df_valid_connections(df_individuals, df_connections) -> pd.DataFrame:
+    known = df_connections["V1"].isin(df_individuals["name"]) & df_connections["V2"].isin(df_individuals["name"])
+    return df_connections[known & (df_connections["V1"] != df_connections["V2"])]
+
+
+def status(report: pd.DataFrame, check: str) -> str:
+    return report.set_index("check").loc[check, "status"]
+
+
+def test_clean_inputs_pass(df_individuals, df_valid_connections):
+    report = validation.validate_inputs(df_individuals, df_valid_connections)
+
+    failed = report[report["status"] == "failed"]
+    assert list(failed["check"]) == ["missing_values"]
+    assert (failed["severity"] == "warning").all()
+
+
+def test_report_counts_failures(df_individuals, df_valid_connections):
+    df = df_individuals.copy()
+    df.loc[:2, "idade"] = -1
+    df.loc[:4, "estuda"] = 2
+    df = pd.concat([df, df.iloc[[10]]], ignore_index=True)
+    df_target = pd.concat([df_valid_connections, pd.DataFrame({"V1": [999], "V2": [1], "prob_V1_V2": [1.5]})])
+
+    report = validation.validate_inputs(df, df_target).set_index("check")
+
+    assert report.loc["idade_range", "n_failed"] == 3
+    assert report.loc["estuda_domain", "n_failed"] == 5
+    assert report.loc["name_unique", "n_failed"] == 1
+    assert report.loc["V1_references_name", "n_failed"] == 1
+    assert report.loc["prob_V1_V2_range", "n_failed"] == 1
+    assert report.loc["V2_references_name", "status"] == "passed"
+
+
+def test_missing_columns_are_reported(df_individuals, df_valid_connections):
+    report = validation.validate_inputs(df_individuals.drop("IMC", axis=1), df_valid_connections)
+
+    assert status(report, "schema").tolist() == ["failed", "passed"]
+    assert status(report, "IMC_range") == "skipped"
+    assert np.isnan(report.set_index("check").loc["IMC_range", "n_failed"])
+
+
+def test_fail_fast_stops_on_first_error(df_individuals, df_valid_connections):
+    df = df_individuals.assign(IMC=df_individuals["IMC"] * 10)
+
+    with pytest.raises(validation.DataValidationError, match="IMC_range"):
+        validation.validate_inputs(df, df_valid_connections, fail_fast=True)
+
+
+def test_fail_fast_ignores_warnings(df_individuals, df_valid_connections):
+    df_target = pd.concat([df_valid_connections, pd.DataFrame({"V1": [1], "V2": [1]})])
+
+    report = validation.validate_inputs(df_individuals, df_target, fail_fast=True)
+
+    assert status(report, "self_loops") == "failed"